@@ -0,0 +1,84 @@
+"""
+Cost of cells on a 1M-cell sheet: the slotted XlrdCellLike (ctype computed once, shared EMPTY_CELL) against the
+dict-based cell it replaced, which recomputed its ctype on every .ctype and .value access.
+
+    python benchmarks/bench_cells.py [ncells]
+
+For each cell type: the time and memory (live, per tracemalloc) to build the cells, then the time for the access
+pattern of XlSheet._read_row (ctype read up to three times, then value).
+"""
+import datetime
+import random
+import sys
+import time
+import tracemalloc
+
+from xlrd.biffh import XL_CELL_EMPTY, XL_CELL_TEXT, XL_CELL_NUMBER, XL_CELL_DATE, XL_CELL_BOOLEAN, XL_CELL_ERROR
+
+from xlstools.xlrd_like import XlrdCellLike
+
+
+class DictCell(object):
+    """
+    The cell before slotting, for comparison
+    """
+    def __init__(self, cell):
+        self._cell = cell
+
+    @property
+    def value(self):
+        if self.ctype == XL_CELL_TEXT:
+            return str(self._cell)
+        return self._cell
+
+    @property
+    def ctype(self):
+        if self._cell is None:
+            return XL_CELL_EMPTY
+        elif isinstance(self._cell, (int, float)):
+            return XL_CELL_NUMBER
+        elif isinstance(self._cell, bool):
+            return XL_CELL_BOOLEAN
+        elif isinstance(self._cell, datetime.datetime):
+            return XL_CELL_DATE
+        else:
+            return XL_CELL_TEXT
+
+
+def sheet_values(n, seed=0):
+    """
+    n mixed values, a third of them empty
+    """
+    rng = random.Random(seed)
+    choices = [None, None, 'text', 1.5, 3, datetime.datetime(2020, 1, 1)]
+    return [rng.choice(choices) for _ in range(n)]
+
+
+def run(cell_type, values):
+    tracemalloc.start()
+    t = time.perf_counter()
+    cells = [cell_type(v) for v in values]
+    build = time.perf_counter() - t
+    live, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    t = time.perf_counter()
+    n = 0
+    for c in cells:
+        if c.ctype == XL_CELL_TEXT or c.ctype == XL_CELL_ERROR or c.ctype == XL_CELL_EMPTY:
+            n += 1
+        c.value
+    access = time.perf_counter() - t
+    return build, access, live
+
+
+def main(n=1000000):
+    values = sheet_values(n)
+    print('%d cells' % n)
+    for label, cell_type in (('dict cell', DictCell), ('XlrdCellLike', XlrdCellLike)):
+        build, access, live = run(cell_type, values)
+        print('%-13s build %.2fs  access %.2fs  total %.2fs  live %.1f MiB' % (label, build, access, build + access,
+                                                                              live / 2 ** 20))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
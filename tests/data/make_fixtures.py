@@ -0,0 +1,154 @@
+"""
+Regenerate the test fixtures in this directory:
+
+    python tests/data/make_fixtures.py
+"""
+import datetime
+import io
+import os
+import re
+import zipfile
+
+import openpyxl
+
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def _path(name):
+    return os.path.join(HERE, name)
+
+
+def bad_dimension():
+    """
+    bad_dimension.xlsx: 301 rows x 6 columns, whose <dimension> tag claims A1:B3
+    """
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = 'data'
+    ws.append(['id', 'name', 'half', 'sparse', 'flag', 'copy'])
+    for i in range(1, 301):
+        ws.append([i, 'a%d' % i, i * 0.5, None if i % 3 else 'x', i % 2 == 0, i])
+    tmp = _path('bad_dimension.tmp.xlsx')
+    wb.save(tmp)
+    with zipfile.ZipFile(tmp) as src, zipfile.ZipFile(_path('bad_dimension.xlsx'), 'w', zipfile.ZIP_DEFLATED) as dst:
+        for info in src.infolist():
+            data = src.read(info.filename)
+            if info.filename.startswith('xl/worksheets/'):
+                data = re.sub(rb'<dimension ref="[^"]*"\s*/>', b'<dimension ref="A1:B3"/>', data)
+            dst.writestr(info, data)
+    os.unlink(tmp)
+
+
+def multi_sheet():
+    """
+    multi_sheet.xlsx: four sheets, each a small table under a title row
+    """
+    wb = openpyxl.Workbook()
+    wb.remove(wb.active)
+    for k in range(4):
+        ws = wb.create_sheet('sheet%d' % k)
+        ws.append(['Report %d' % k])
+        ws.append([])
+        ws.append(['id', 'name', 'qty'])
+        for i in range(1, 21):
+            ws.append([i, 'item %d-%d' % (k, i), i * (k + 1)])
+    wb.save(_path('multi_sheet.xlsx'))
+
+
+_EXTRA_ROW = (b'<row r="%d"><c r="A%d" t="inlineStr"><is><r><t>rich</t></r><r><t xml:space="preserve"> text</t></r>'
+              b'</is></c><c t="str"><f>A1</f><v>name</v></c><c t="e"><v>#N/A</v></c><c t="b"><v>0</v></c></row>')
+
+
+def strings():
+    """
+    strings.xlsx: the same values on two sheets, 'inline' with inline strings (as openpyxl writes them) and 'shared'
+    with a shared string table (as Excel writes them).  Each ends with a row written by hand: rich text, a cached
+    formula string, an error and a boolean, the last three without cell references
+    """
+    wb = openpyxl.Workbook()
+    wb.remove(wb.active)
+    for title in ('inline', 'shared'):
+        ws = wb.create_sheet(title)
+        ws.append(['name', 'count', 'ratio', 'flag', 'when', None, 'note'])
+        for i in range(1, 31):
+            ws.append(['name %d' % (i % 7), i * 1000003, i / 7, i % 3 == 0,
+                       datetime.datetime(2020, 1, 1) + datetime.timedelta(days=i, seconds=i * 61),
+                       None, None if i % 4 else 'a & b <%d>' % i])
+        ws.cell(40, 10, 'far corner')
+    out = io.BytesIO()
+    wb.save(out)
+    extra = _EXTRA_ROW % (41, 41)
+    with zipfile.ZipFile(out) as src, zipfile.ZipFile(_path('strings.xlsx'), 'w', zipfile.ZIP_DEFLATED) as dst:
+        for info in src.infolist():
+            data = src.read(info.filename)
+            if info.filename == 'xl/worksheets/sheet1.xml':
+                data = data.replace(b'</sheetData>', extra + b'</sheetData>')
+            elif info.filename == 'xl/worksheets/sheet2.xml':
+                shared = []
+
+                def _share(m):
+                    shared.append(b'<si><t>%s</t></si>' % m.group(2))
+                    return b'<c r="%s" t="s"><v>%d</v></c>' % (m.group(1), len(shared) - 1)
+                data = re.sub(rb'<c r="(\w+)" t="inlineStr"><is><t>([^<]*)</t></is></c>', _share, data)
+                rich = re.search(rb'<is>(.*?)</is>', extra).group(1)
+                shared.append(b'<si>%s</si>' % rich)
+                data = data.replace(b'</sheetData>', re.sub(rb't="inlineStr"><is>.*?</is>',
+                                                            b't="s"><v>%d</v>' % (len(shared) - 1), extra, count=1)
+                                    + b'</sheetData>')
+                dst.writestr('xl/sharedStrings.xml',
+                             b'<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" count="%d" '
+                             b'uniqueCount="%d">%s</sst>' % (len(shared), len(shared), b''.join(shared)))
+            elif info.filename == 'xl/_rels/workbook.xml.rels':
+                data = data.replace(b'</Relationships>', b'<Relationship Id="rIdSst" Target="sharedStrings.xml" '
+                                    b'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/'
+                                    b'sharedStrings"/></Relationships>')
+            elif info.filename == '[Content_Types].xml':
+                data = data.replace(b'</Types>', b'<Override PartName="/xl/sharedStrings.xml" ContentType="application/'
+                                    b'vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/></Types>')
+            dst.writestr(info, data)
+
+
+def quoted():
+    """
+    quoted.csv: 600 rows with a BOM and CRLF line ends, blank lines, NA strings, and on every 37th row a quoted field
+    holding newlines and doubled quotes.  'mixed' is int until row 400 and float after; 'late' is empty until row 500
+    """
+    lines = ['id,text,value,flag,mixed,late']
+    for i in range(600):
+        text = '"line %d\nnext ""q""\r\nlast"' % i if i % 37 == 0 else 'plain %d' % i
+        value = 'NA' if i % 11 == 0 else repr(((i * 7919) % 1000) / 997)
+        flag = '' if i % 13 == 0 else ('true', 'False')[i % 2]
+        mixed = str(i) if i < 400 else '%d.5' % i
+        late = 'late %d' % i if i >= 500 and i % 3 else ''
+        lines.append(','.join([str(i), text, value, flag, mixed, late]))
+        if i % 50 == 49:
+            lines.append('')
+    with open(_path('quoted.csv'), 'w', encoding='utf-8-sig', newline='') as fp:
+        fp.write('\r\n'.join(lines) + '\r\n')
+
+
+def blank_cells():
+    """
+    blank_cells.xls: a table with formatted empty cells, which xlrd reads as XL_CELL_BLANK with formatting_info and as
+    XL_CELL_EMPTY without.  Needs xlwt
+    """
+    import xlwt
+    wb = xlwt.Workbook()
+    ws = wb.add_sheet('data')
+    boxed = xlwt.easyxf('borders: left thin, right thin, top thin, bottom thin')
+    for j, header in enumerate(['id', 'name', 'qty']):
+        ws.write(0, j, header)
+    for i in range(1, 11):
+        ws.write(i, 0, i)
+        ws.write(i, 1, 'item %d' % i if i % 3 else '', boxed)
+        ws.write(i, 2, i * 2 if i % 4 else None, boxed)
+    wb.save(_path('blank_cells.xls'))
+
+
+if __name__ == '__main__':
+    bad_dimension()
+    multi_sheet()
+    strings()
+    quoted()
+    blank_cells()
@@ -0,0 +1,66 @@
+import bz2
+import gzip
+import lzma
+import os
+import shutil
+import tempfile
+import tracemalloc
+import unittest
+import zipfile
+
+from xlstools.compressed import read_decompressed
+from xlstools.sources import sniff
+
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+
+def _compress(path, content):
+    if path.endswith('.zip'):
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr('quoted.csv', content)
+        return
+    opener = {'.gz': gzip.open, '.bz2': bz2.open, '.xz': lzma.open}[os.path.splitext(path)[1]]
+    with opener(path, 'wb') as fp:
+        fp.write(content)
+
+
+class ReadDecompressedTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_round_trip(self):
+        with open(os.path.join(DATA, 'quoted.csv'), 'rb') as fp:
+            content = fp.read()
+        for name in ('quoted.csv.gz', 'quoted.csv.bz2', 'quoted.csv.xz', 'quoted.zip'):
+            with self.subTest(name=name):
+                path = os.path.join(self.tmp, name)
+                _compress(path, content)
+                self.assertEqual(read_decompressed(path), content)
+                with open(path, 'rb') as fp:
+                    self.assertEqual(sniff(fp.read()), ('csv', content, 'quoted.csv' if name.endswith('.zip') else None))
+
+    def test_held_once(self):
+        """
+        Decompressing holds the content about once, not once in blocks and again joined
+        """
+        content = os.urandom(1 << 20).hex().encode() * 8  # 16 MiB
+        for name in ('big.csv.gz', 'big.zip'):
+            with self.subTest(name=name):
+                path = os.path.join(self.tmp, name)
+                _compress(path, content)
+                tracemalloc.start()
+                try:
+                    data = read_decompressed(path)
+                    peak = tracemalloc.get_traced_memory()[1]
+                finally:
+                    tracemalloc.stop()
+                self.assertEqual(len(data), len(content))
+                self.assertLess(peak, 1.5 * len(content))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import os
+import unittest
+from unittest import mock
+
+from xlstools import ingest
+
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+
+def _read_or_die(path, sheet, reader_args, rowdict):
+    """
+    Stands in for the worker: a path named 'die' kills its process
+    """
+    if path == 'die':
+        os._exit(1)
+    return [('sheet', [[path]])]
+
+
+class IngestTest(unittest.TestCase):
+    def test_reads(self):
+        path = os.path.join(DATA, 'multi_sheet.xlsx')
+        batch = ingest([path, os.path.join(DATA, 'missing.xlsx')], sheet=None, max_workers=2)
+        names = sorted(name for _, name, _ in batch)
+        self.assertEqual(names, ['sheet0', 'sheet1', 'sheet2', 'sheet3'])
+        self.assertEqual(list(batch.failures), [os.path.join(DATA, 'missing.xlsx')])
+
+    def test_dead_worker(self):
+        """
+        A worker that dies fails the file(s) in flight; the batch goes on in a new pool
+        """
+        paths = ['a', 'b', 'die', 'c', 'd', 'e']
+        with mock.patch('xlstools.ingest._ingest_file', _read_or_die):
+            batch = ingest(paths, max_workers=1, max_pending=1)
+            done = sorted(path for path, _, _ in batch)
+        self.assertEqual(done, ['a', 'b', 'c', 'd', 'e'])
+        self.assertEqual(list(batch.failures), ['die'])
+        self.assertTrue(batch.failures['die'].startswith('BrokenProcessPool'))
+
+    def test_dead_worker_in_flight(self):
+        paths = ['a', 'die', 'b', 'c', 'd', 'e', 'f']
+        with mock.patch('xlstools.ingest._ingest_file', _read_or_die):
+            batch = ingest(paths, max_workers=2, max_pending=3)
+            done = [path for path, _, _ in batch]
+        self.assertIn('die', batch.failures)
+        self.assertEqual(sorted(done + list(batch.failures)), sorted(paths))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+import codecs
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from xlstools.csv_reader import CsvWorkbook, pd
+from xlstools import native_csv
+from xlstools.native_csv import NativeCsvSheet, INDEX_STRIDE
+
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+QUOTED = os.path.join(DATA, 'quoted.csv')
+
+
+def _typed_columns(sheet):
+    """
+    All of read_columns, with each value's type, so that 4 and 4.0 differ
+    """
+    values, ctypes = sheet.read_columns(0, sheet.nrows, 0, sheet.ncols)
+    return [[(type(v), v) for v in k] for k in values], ctypes
+
+
+@unittest.skipIf(pd is None, 'pandas is not installed')
+class PandasEquivalenceTest(unittest.TestCase):
+    """
+    The native engine reads what pandas reads.  pandas' default float parser may be off in the last digit, so it is
+    asked for round-trip floats, as float() parses them.
+    """
+    def test_quoted(self):
+        expected = CsvWorkbook(QUOTED, engine='pandas', float_precision='round_trip').sheet_by_index(0)
+        native = CsvWorkbook(QUOTED, engine='native').sheet_by_index(0)
+        self.assertIsInstance(native, NativeCsvSheet)
+        self.assertEqual((native.name, native.nrows, native.ncols), (expected.name, expected.nrows, expected.ncols))
+        self.assertEqual(native.kinds, ['int', 'str', 'float', 'bool', 'float', 'str'])
+        self.assertEqual(_typed_columns(native), _typed_columns(expected))
+        self.assertEqual([[c.value for c in row] for row in native.get_rows()],
+                         [[c.value for c in row] for row in expected.get_rows()])
+
+    def test_na_values(self):
+        kwargs = dict(na_values=['plain 3', 'true'], keep_default_na=False)
+        expected = CsvWorkbook(QUOTED, engine='pandas', float_precision='round_trip', **kwargs).sheet_by_index(0)
+        native = CsvWorkbook(QUOTED, engine='native', **kwargs).sheet_by_index(0)
+        self.assertEqual(native.kinds, ['int', 'str', 'str', 'str', 'float', 'str'])
+        self.assertEqual(_typed_columns(native), _typed_columns(expected))
+
+
+def _rows(sheet):
+    return [[c.value for c in row] for row in sheet.get_rows()]
+
+
+class IndexTest(unittest.TestCase):
+    """
+    Reads through the row index agree with a straight pass, and a saved index is only used while the file is unchanged
+    """
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, 'quoted.csv')
+        shutil.copyfile(QUOTED, self.path)
+        self.index = self.path + '.index'
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_random_access(self):
+        sheet = NativeCsvSheet(QUOTED)
+        rows = _rows(sheet)
+        self.assertEqual(len(rows), sheet.nrows)
+        for i in list(range(sheet.nrows - 1, -1, -1)) + [INDEX_STRIDE - 1, INDEX_STRIDE, 2 * INDEX_STRIDE + 1]:
+            self.assertEqual([c.value for c in sheet.row(i)], rows[i], i)
+        for r0 in (0, 1, INDEX_STRIDE - 1, 300, sheet.nrows - 5):
+            self.assertEqual(sheet.read_columns(r0, r0 + 70, 1, 4)[0], [list(k) for k in zip(*rows[r0:r0 + 70])][1:4])
+
+    def test_reused(self):
+        built = NativeCsvSheet(self.path, index=True)
+        self.assertTrue(os.path.exists(self.index))
+        with mock.patch.object(NativeCsvSheet, '_scan', side_effect=AssertionError('index not reused')):
+            loaded = NativeCsvSheet(self.path, index=self.index)
+        self.assertEqual((loaded.nrows, loaded.ncols, loaded.kinds), (built.nrows, built.ncols, built.kinds))
+        self.assertEqual(_rows(loaded), _rows(built))
+
+    def _rewritten(self, old, new):
+        """
+        Open the file with its saved index after replacing old with new in it (keeping its mtime if the size changes,
+        so that only the size can tell)
+        """
+        NativeCsvSheet(self.path, index=True)
+        st = os.stat(self.path)
+        with open(self.path, 'rb') as fp:
+            data = fp.read()
+        with open(self.path, 'wb') as fp:
+            fp.write(data.replace(old, new, 1))
+        if len(old) != len(new):
+            os.utime(self.path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        else:
+            os.utime(self.path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+        return NativeCsvSheet(self.path, index=True)
+
+    def test_same_size_change(self):
+        sheet = self._rewritten(b'\r\n7,plain 7,', b'\r\n7\r\nplain 7')
+        self.assertEqual((sheet.nrows, sheet.kinds[0]), (602, 'str'))
+        self.assertEqual([c.value for c in sheet.row(9)], ['plain 70.43430290872617855', 'False', 7.0, None, None, None])
+        self.assertEqual(_rows(sheet), _rows(NativeCsvSheet(self.path)))
+
+    def test_size_change(self):
+        sheet = self._rewritten(b'\r\n1,plain 1,', b'\r\n1,plain 1\r\n"x\r\ny",2,')
+        self.assertEqual((sheet.nrows, sheet.kinds[0]), (602, 'str'))
+        self.assertEqual(_rows(sheet), _rows(NativeCsvSheet(self.path)))
+        with mock.patch.object(NativeCsvSheet, '_scan', side_effect=AssertionError('index not reused')):
+            self.assertEqual(NativeCsvSheet(self.path, index=True).nrows, 602)
+
+    def test_damaged(self):
+        NativeCsvSheet(self.path, index=True)
+        with open(self.index, 'r+b') as fp:
+            fp.truncate(os.path.getsize(self.index) - 8)
+        self.assertEqual(_rows(NativeCsvSheet(self.path, index=True)), _rows(NativeCsvSheet(self.path)))
+
+
+class ParallelTest(unittest.TestCase):
+    """
+    parallel=True gives the same sheet as a single pass, with the file cut into many small parts
+    """
+    def _assert_same(self, max_workers):
+        single = NativeCsvSheet(QUOTED)
+        parallel = NativeCsvSheet(QUOTED, parallel=True, max_workers=max_workers)
+        self.assertEqual((parallel.nrows, parallel.ncols, parallel.kinds), (single.nrows, single.ncols, single.kinds))
+        self.assertEqual(_typed_columns(parallel), _typed_columns(single))  # split among workers, by row
+        self.assertEqual(_rows(parallel), _rows(single))
+        for i in range(0, single.nrows, 7):
+            self.assertEqual([c.value for c in parallel.row(i)], [c.value for c in single.row(i)], i)
+
+    @mock.patch.object(native_csv, 'PARALLEL_ROWS', 100)
+    @mock.patch.object(native_csv, 'PART_BYTES', 1000)
+    def test_small_parts(self):
+        for max_workers in (2, 7, 25):
+            with self.subTest(max_workers=max_workers):
+                self._assert_same(max_workers)
+
+    @mock.patch.object(native_csv, 'PARALLEL_ROWS', 100)
+    def test_cut_in_quotes(self):
+        """
+        The first cut falls inside a quoted field that holds newlines: the part must end after the field instead
+        """
+        with open(QUOTED, 'rb') as fp:
+            data = fp.read()
+        start = len(codecs.BOM_UTF8)
+        inside = data.index(b'\nnext', data.index(b'"line', len(data) // 2)) - 1
+        with mock.patch.object(native_csv, 'PART_BYTES', inside - start):
+            bounds = native_csv._split(data, start, 2, b'"')
+            self.assertGreater(bounds[1], data.index(b'last"', inside))
+            self.assertEqual(data[bounds[1] - 2:bounds[1]], b'\r\n')
+            self._assert_same(2)
+
+
+if __name__ == '__main__':
+    unittest.main()
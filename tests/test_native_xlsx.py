@@ -0,0 +1,51 @@
+import os
+import unittest
+
+from xlstools import open_xl
+from xlstools.xlrd_like import read_columns
+
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+
+def _typed(sheet):
+    """
+    Every cell as (ctype, type, value), so that 4 and 4.0 differ
+    """
+    return [[(c.ctype, type(c.value), c.value) for c in row] for row in sheet.get_rows()]
+
+
+class NativeXlsxTest(unittest.TestCase):
+    """
+    The native engine reads what openpyxl reads, from shared and inline strings alike
+    """
+    path = os.path.join(DATA, 'strings.xlsx')
+
+    def _assert_same(self, path):
+        expected = open_xl(path)
+        native = open_xl(path, engine='native')
+        self.assertEqual(native.sheet_names(), expected.sheet_names())
+        for name in expected.sheet_names():
+            with self.subTest(sheet=name):
+                e = expected.sheet_by_name(name)
+                n = native.sheet_by_name(name)
+                self.assertEqual((n.nrows, n.ncols), (e.nrows, e.ncols))
+                self.assertEqual(_typed(n), _typed(e))
+                self.assertEqual(read_columns(n, 0, n.nrows, 0, n.ncols), read_columns(e, 0, e.nrows, 0, e.ncols))
+
+    def test_strings(self):
+        self._assert_same(self.path)
+
+    def test_inline_and_shared_agree(self):
+        native = open_xl(self.path, engine='native')
+        self.assertEqual(_typed(native.sheet_by_name('inline')), _typed(native.sheet_by_name('shared')))
+        self.assertEqual([c.value for c in native.sheet_by_name('shared').row(40)[:4]], ['rich text', 'name', '#N/A', False])
+
+    def test_other_fixtures(self):
+        for name in ('bad_dimension.xlsx', 'multi_sheet.xlsx'):
+            with self.subTest(fixture=name):
+                self._assert_same(os.path.join(DATA, name))
+
+
+if __name__ == '__main__':
+    unittest.main()
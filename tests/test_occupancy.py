@@ -0,0 +1,97 @@
+import random
+import unittest
+
+from xlstools.occupancy import Occupancy
+from xlstools.value_grid import ValueGrid, GridSheet
+from xlstools.xl_sheet import find_tables
+
+
+def _sheet(picture):
+    """
+    A sheet drawn as strings: 'x' for a non-empty cell, '.' for an empty one
+    """
+    rows = [[1 if k == 'x' else None for k in line] for line in picture]
+    return GridSheet('drawn', ValueGrid.from_rows(rows, max(map(len, rows))))
+
+
+def _flood_blocks(picture):
+    """
+    Bounding boxes of the 8-connected regions, by flood fill: what Occupancy.blocks must find
+    """
+    filled = {(r, c) for r, line in enumerate(picture) for c, k in enumerate(line) if k == 'x'}
+    boxes = []
+    while filled:
+        stack = [filled.pop()]
+        r0, c0 = r1, c1 = stack[0]
+        while stack:
+            r, c = stack.pop()
+            r0, r1, c0, c1 = min(r0, r), max(r1, r), min(c0, c), max(c1, c)
+            for dr in (-1, 0, 1):
+                for dc in (-1, 0, 1):
+                    if (r + dr, c + dc) in filled:
+                        filled.remove((r + dr, c + dc))
+                        stack.append((r + dr, c + dc))
+        boxes.append((r0, r1 + 1, c0, c1 + 1))
+    return sorted(boxes)
+
+
+class BlocksTest(unittest.TestCase):
+    def _check(self, picture):
+        blocks = Occupancy.from_sheet(_sheet(picture)).blocks()
+        self.assertEqual(blocks, sorted(blocks, key=lambda b: (b[0], b[2])))
+        self.assertEqual(sorted(blocks), _flood_blocks(picture))
+
+    def test_shapes(self):
+        shapes = {
+            'u': ['x...x',
+                  'x...x',
+                  'xxxxx'],
+            'diagonal': ['x...',
+                         '.x..',
+                         '..x.',
+                         '...x'],
+            'comb': ['x.x.x.x',
+                     'xxxxxxx'],
+            'spiral': ['xxxxx',
+                       '....x',
+                       'xxx.x',
+                       'x...x',
+                       'xxxxx'],
+            'separate': ['xx.xx',
+                         'xx.xx',
+                         '.....',
+                         'xxxxx'],
+            'bridge': ['x.x.x',
+                       '.x.x.'],
+        }
+        for name, picture in shapes.items():
+            with self.subTest(shape=name):
+                self._check(picture)
+
+    def test_random(self):
+        rng = random.Random(13)
+        for i in range(300):
+            nrows, ncols = rng.randint(1, 12), rng.randint(1, 12)
+            density = rng.choice((0.2, 0.35, 0.5))
+            picture = [''.join('x' if rng.random() < density else '.' for _ in range(ncols)) for _ in range(nrows)]
+            with self.subTest(picture=picture):
+                self._check(picture)
+
+
+class FindTablesTest(unittest.TestCase):
+    def test_stacked_and_side_by_side(self):
+        picture = ['x.......',
+                   '........',
+                   'xxx..xx.',
+                   'xxx..xx.',
+                   'xxx..xx.',
+                   '........',
+                   '.xxxx...',
+                   '.xxxx...']
+        tables = find_tables(_sheet(picture))
+        self.assertEqual([(t.headerrow, t.datarow, t.datacol, t.lastrow) for t in tables],
+                         [(2, 3, 0, 5), (2, 3, 5, 5), (6, 7, 1, 8)])
+
+
+if __name__ == '__main__':
+    unittest.main()
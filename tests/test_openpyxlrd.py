@@ -0,0 +1,33 @@
+import os
+import unittest
+
+from xlstools import open_xl
+
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+
+def _values(sheet):
+    return [[c.value for c in row] for row in sheet.get_rows()]
+
+
+class BadDimensionTest(unittest.TestCase):
+    """
+    A sheet whose <dimension> tag is smaller than its data is read whole by every engine
+    """
+    path = os.path.join(DATA, 'bad_dimension.xlsx')
+
+    def test_read_only(self):
+        sheet = open_xl(self.path, read_only=True).sheet_by_index(0)
+        self.assertEqual((sheet.nrows, sheet.ncols), (301, 6))
+        self.assertEqual([c.value for c in sheet.row(300)], [300, 'a300', 150, 'x', True, 300])
+
+    def test_engines_agree(self):
+        full = _values(open_xl(self.path).sheet_by_index(0))
+        self.assertEqual(len(full), 301)
+        self.assertEqual(_values(open_xl(self.path, read_only=True).sheet_by_index(0)), full)
+        self.assertEqual(_values(open_xl(self.path, engine='native').sheet_by_index(0)), full)
+
+
+if __name__ == '__main__':
+    unittest.main()
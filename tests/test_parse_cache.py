@@ -0,0 +1,95 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from xlrd import XLRDError
+
+from xlstools import ParseCache, XlReader, open_xl
+
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_KEY = '''
+import sys
+from xlstools import ParseCache
+cache = ParseCache(sys.argv[1])
+print(cache.key(sys.argv[2], engine='native', na_values={'n/a', '-', 'missing', 'none', '?'},
+                dtype={'b': str, 'a': int}, usecols=['a', 'b']))
+'''
+
+
+class ParseCacheTest(unittest.TestCase):
+    def test_key_independent_of_hash_seed(self):
+        """
+        Processes with different hash seeds share cache entries, even with set-valued options
+        """
+        with tempfile.TemporaryDirectory() as d:
+            keys = set()
+            for seed in ('1', '2', '3'):
+                env = dict(os.environ, PYTHONHASHSEED=seed, PYTHONPATH=ROOT)
+                out = subprocess.run([sys.executable, '-c', _KEY, d, os.path.join(DATA, 'multi_sheet.xlsx')],
+                                     env=env, capture_output=True, text=True, check=True)
+                keys.add(out.stdout.strip())
+            self.assertEqual(len(keys), 1)
+
+    def test_reopen(self):
+        path = os.path.join(DATA, 'multi_sheet.xlsx')
+        expected = [[[c.value for c in r] for r in s.get_rows()] for s in open_xl(path).sheets()]
+        with tempfile.TemporaryDirectory() as d:
+            for _ in range(2):  # miss, then hit
+                book = open_xl(path, cache=d)
+                self.assertEqual([[[c.value for c in r] for r in s.get_rows()] for s in book.sheets()], expected)
+
+    def test_formatting_info(self):
+        """
+        XLS blank cells are read differently with formatting_info, so the two are cached apart
+        """
+        path = os.path.join(DATA, 'blank_cells.xls')
+        with tempfile.TemporaryDirectory() as d:
+            for _ in range(2):
+                for formatting_info in (True, False):
+                    expected = open_xl(path, formatting_info=formatting_info).sheet_by_index(0)
+                    cached = open_xl(path, formatting_info=formatting_info, cache=d).sheet_by_index(0)
+                    self.assertEqual([[c.ctype for c in r] for r in cached.get_rows()],
+                                     [[c.ctype for c in r] for r in expected.get_rows()])
+
+    def test_unknown_sheet(self):
+        """
+        An unknown sheet name raises what the file's own reader raises, whether the names were cached or not
+        """
+        with tempfile.TemporaryDirectory() as d:
+            for name, error in (('multi_sheet.xlsx', KeyError), ('blank_cells.xls', XLRDError)):
+                path = os.path.join(DATA, name)
+                with self.assertRaises(error):
+                    open_xl(path).sheet_by_name('nonesuch')
+                for _ in range(2):
+                    with self.subTest(name=name):
+                        with self.assertRaises(error):
+                            open_xl(path, cache=d).sheet_by_name('nonesuch')
+
+    def test_close(self):
+        """
+        Closing an XlReader over a cached workbook releases the file it opened (on a miss) and unmaps the cached
+        sheets (on a hit)
+        """
+        path = os.path.join(DATA, 'blank_cells.xls')
+        with tempfile.TemporaryDirectory() as d:
+            with XlReader(path, cache=d) as xl:
+                self.assertEqual(xl[0].nrows, 11)
+                book = xl._xl._book
+                self.assertIsNotNone(book.mem)
+            self.assertIsNone(book.mem)  # released by xlrd
+
+            with XlReader(path, cache=d) as xl:
+                self.assertEqual(xl[0].nrows, 11)
+                self.assertIsNone(xl._xl._book)  # served from the cache, without opening the file
+                grid = xl._xl.sheet_by_index(0).grid
+                self.assertFalse(grid._mm.closed)
+            self.assertTrue(grid._mm.closed)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+import os
+import unittest
+from unittest import mock
+
+from xlstools import XlReader
+
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+
+def _rows(xs):
+    return [row for _, row in xs.gen_rows()]
+
+
+class ParallelBudgetTest(unittest.TestCase):
+    path = os.path.join(DATA, 'multi_sheet.xlsx')
+
+    def test_sheets_not_parsed_twice(self):
+        """
+        sheets() with parallel=True and max_sheets returns every sheet from the pool, parsing none again in-process
+        """
+        expected = [_rows(xs) for xs in XlReader(self.path).sheets()]
+        xl = XlReader(self.path, parallel=True, max_workers=2, max_sheets=1)
+        with mock.patch.object(XlReader, '_check_xl_sheet', side_effect=AssertionError('parsed in-process')):
+            sheets = xl.sheets()
+        self.assertEqual([_rows(xs) for xs in sheets], expected)
+        self.assertEqual(sum(1 for k in xl._sheets if k is not None), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import openpyxl
+
+from xlstools import open_xl
+from xlstools.xl_sheet import XlSheet
+
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+
+class AggregateCountTest(unittest.TestCase):
+    """
+    count=True counts the data rows that gen_rows yields, with or without other columns to aggregate
+    """
+    def test_count(self):
+        path = os.path.join(DATA, 'bad_dimension.xlsx')
+        for kwargs in ({}, {'read_only': True}):
+            with self.subTest(**kwargs):
+                sheet = XlSheet(open_xl(path, **kwargs).sheet_by_index(0))
+                self.assertEqual(sheet.aggregate(count=True), [{'count': 300}])
+                self.assertEqual(sheet.aggregate(by='flag', count=True),
+                                 [{'flag': False, 'count': 150}, {'flag': True, 'count': 150}])
+                self.assertEqual(sheet.aggregate(count='sparse'), [{'count(sparse)': 100}])
+
+    def test_row_gaps(self):
+        """
+        With ROW_GAPS a row is blank, and skipped, only if none of its cells holds data: a row with a value in a column
+        that is not aggregated still counts, as gen_rows yields it
+        """
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        path = os.path.join(tmp, 'gaps.xlsx')
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.append(['id', 'group', 'qty', 'note'])
+        ws.append([1, 'a', 10])
+        ws.append([])
+        ws.append([None, None, None, 'only a note'])
+        ws.append([2, 'b', 20])
+        ws.append([])
+        ws.append([3, 'a', 30, 'x'])
+        wb.save(path)
+        for kwargs in ({}, {'read_only': True}):
+            with self.subTest(**kwargs):
+                sheet = XlSheet(open_xl(path, **kwargs).sheet_by_index(0), strict=True, row_gaps=True)
+                rows = list(sheet.gen_rows())
+                self.assertEqual(len(rows), 4)
+                self.assertEqual(sheet.aggregate(count=True), [{'count': 4}])
+                self.assertEqual(sheet.aggregate(by='group', count=True, sum='qty'),
+                                 [{'group': 'a', 'count': 2, 'sum(qty)': 40},
+                                  {'group': None, 'count': 1, 'sum(qty)': 0},
+                                  {'group': 'b', 'count': 1, 'sum(qty)': 20}])
+                self.assertEqual(sheet.aggregate(count='id'), [{'count(id)': 3}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import os
+import pickle
+import tempfile
+import unittest
+
+from xlrd import XLRDError
+from xlrd.biffh import XL_CELL_EMPTY, XL_CELL_NUMBER, XL_CELL_TEXT
+
+from xlstools import open_xl
+from xlstools.xlrd_like import XlrdCellLike, EMPTY_CELL
+from xlstools.google_sheet_reader import GSheetCell
+
+
+class Stripped(XlrdCellLike):
+    """
+    A subclass in the documented style: converts in __new__
+    """
+    __slots__ = ()
+
+    def __new__(cls, cell):
+        return super(Stripped, cls).__new__(cls, cell.strip() or None)
+
+
+class OldStyle(XlrdCellLike):
+    """
+    A subclass written against the former, mutable cell
+    """
+    def __init__(self, cell):
+        super(OldStyle, self).__init__(cell)
+
+
+class CellSubclassTest(unittest.TestCase):
+    def test_base(self):
+        self.assertIs(XlrdCellLike(None), EMPTY_CELL)
+        self.assertEqual((XlrdCellLike(3).ctype, XlrdCellLike('3').ctype), (XL_CELL_NUMBER, XL_CELL_TEXT))
+        for cell in (EMPTY_CELL, XlrdCellLike(3.5), XlrdCellLike('x')):
+            copy = pickle.loads(pickle.dumps(cell))
+            self.assertIs(type(copy), XlrdCellLike)
+            self.assertEqual((copy.ctype, copy.value), (cell.ctype, cell.value))
+        self.assertIs(pickle.loads(pickle.dumps(EMPTY_CELL)), EMPTY_CELL)
+
+    def test_new(self):
+        cell = Stripped(' x ')
+        self.assertIs(type(cell), Stripped)
+        self.assertEqual((cell.ctype, cell.value), (XL_CELL_TEXT, 'x'))
+        empty = Stripped('  ')
+        self.assertIs(type(empty), Stripped)
+        self.assertEqual(empty.ctype, XL_CELL_EMPTY)
+        self.assertIs(Stripped(''), empty)
+        self.assertIsNot(empty, EMPTY_CELL)
+        for k in (cell, empty):
+            copy = pickle.loads(pickle.dumps(k))
+            self.assertIs(type(copy), Stripped)
+            self.assertEqual((copy.ctype, copy.value), (k.ctype, k.value))
+
+    def test_init(self):
+        cell = OldStyle(2)
+        self.assertIs(type(cell), OldStyle)
+        self.assertEqual((cell.ctype, cell.value), (XL_CELL_NUMBER, 2))
+        with self.assertRaises(AttributeError):
+            cell.value = 3
+
+    def test_gsheet_cell(self):
+        cells = [GSheetCell(k) for k in ('', '1.5', 'text')]
+        self.assertTrue(all(isinstance(k, GSheetCell) for k in cells))
+        self.assertEqual([(k.ctype, k.value) for k in cells],
+                         [(XL_CELL_EMPTY, None), (XL_CELL_NUMBER, 1.5), (XL_CELL_TEXT, 'text')])
+        self.assertEqual([type(pickle.loads(pickle.dumps(k))) for k in cells], [GSheetCell] * 3)
+
+        class Upper(GSheetCell):
+            __slots__ = ()
+
+            def __new__(cls, str_value):
+                return super(Upper, cls).__new__(cls, str_value.upper())
+        self.assertEqual(Upper('abc').value, 'ABC')
+        self.assertIsInstance(Upper('abc'), GSheetCell)
+
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+
+class SheetIndexTest(unittest.TestCase):
+    def test_unknown_name(self):
+        """
+        unload_sheet raises the same error as sheet_by_name for a name that is not in the workbook
+        """
+        with tempfile.TemporaryDirectory() as d:
+            for name, kwargs in (('multi_sheet.xlsx', {}), ('multi_sheet.xlsx', {'engine': 'native'}),
+                                 ('multi_sheet.xlsx', {'cache': d}), ('blank_cells.xls', {'cache': d})):
+                with self.subTest(name=name, **kwargs):
+                    book = open_xl(os.path.join(DATA, name), **kwargs)
+                    with self.assertRaises(Exception) as expected:
+                        book.sheet_by_name('nonesuch')
+                    with self.assertRaises(Exception) as raised:
+                        book.unload_sheet('nonesuch')
+                    self.assertIs(type(raised.exception), type(expected.exception))
+                    self.assertIsInstance(raised.exception, KeyError if name.endswith('xlsx') else XLRDError)
+                    book.unload_sheet(book.sheet_names()[-1])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -11,7 +11,10 @@ from datetime import datetime
 from .xl_reader import XlReader
 from .xl_sheet import XlSheet
 from .openpyxlrd import OpenpyXlrdWorkbook
+from .native_xlsx import NativeXlsxWorkbook
 from .open_xl import open_xl
+from .parse_cache import ParseCache
+from .ingest import ingest
 from .util import colnum_to_col, col_to_colnum
 # from .exchanges_from_spreadsheet import exchanges_from_spreadsheet
 
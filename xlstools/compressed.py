@@ -0,0 +1,106 @@
+"""
+Compressed spreadsheets: files ending .gz, .bz2 or .xz, and .zip archives holding a single spreadsheet (an XLSX, which
+is itself a zip archive, is not one of these).  The name without the compression suffix-- or the name of the file in
+the archive-- tells what kind of spreadsheet is inside.
+
+The content is read through the decompressor in large blocks, never written to disk.  CSVs are streamed by pandas, or
+read into memory by the native reader; XLS and XLSX readers need to seek, so they are given the decompressed bytes.
+"""
+import bz2
+import gzip
+import io
+import lzma
+import os
+import shutil
+import zipfile
+
+
+READ_BYTES = 1 << 20  # size of each read from the decompressor
+
+SPREADSHEET_SUFFIXES = ('.csv', '.xls', '.xlsx', '.xlsm')
+
+_OPENERS = {
+    '.gz': gzip.open,
+    '.bz2': bz2.open,
+    '.xz': lzma.open,
+}
+
+
+def _member(archive):
+    """
+    The one spreadsheet in a zip archive
+    :param archive: a ZipFile
+    :return: member name
+    """
+    found = [k for k in archive.namelist() if k.lower().endswith(SPREADSHEET_SUFFIXES)
+             and not os.path.basename(k).startswith('.') and not k.startswith('__MACOSX/')]
+    if len(found) != 1:
+        raise ValueError('%s: expected one spreadsheet in the archive; found %s' % (archive.filename, found))
+    return found[0]
+
+
+def compression(path):
+    """
+    :param path:
+    :return: '.gz', '.bz2', '.xz' or '.zip' if the file is compressed, else None
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext in _OPENERS:
+        return ext
+    if ext == '.zip':
+        with zipfile.ZipFile(path) as archive:
+            if '[Content_Types].xml' not in archive.namelist():  # else an XLSX with an unusual name
+                return ext
+    return None
+
+
+def decompressed_name(path):
+    """
+    The name of the file inside: path without its compression suffix, or the name of the spreadsheet in a zip
+    archive.  An uncompressed path is returned as is.
+    :param path:
+    :return:
+    """
+    ext = compression(path)
+    if ext is None:
+        return path
+    if ext == '.zip':
+        with zipfile.ZipFile(path) as archive:
+            return _member(archive)
+    return path[:-len(ext)]
+
+
+def open_decompressed(path):
+    """
+    :param path: a compressed file
+    :return: binary file object of the decompressed content, read READ_BYTES at a time
+    """
+    ext = compression(path)
+    if ext == '.zip':
+        with zipfile.ZipFile(path) as archive:
+            fp = archive.open(_member(archive))  # keeps the file open after the archive is closed
+    else:
+        fp = _OPENERS[ext](path, 'rb')
+    return io.BufferedReader(fp, READ_BYTES)
+
+
+def _read_all(fp):
+    """
+    The rest of a decompressed stream, READ_BYTES at a time into one BytesIO, whose buffer grows in place and becomes
+    the returned bytes: the content is held once.  (fp.read() joins a list of blocks, inside the decompressors, and
+    so holds it twice.)
+    :param fp: binary file object
+    :return: bytes
+    """
+    with io.BytesIO() as out:
+        shutil.copyfileobj(fp, out, READ_BYTES)
+        return out.getvalue()
+
+
+def read_decompressed(path):
+    """
+    :param path: a compressed file
+    :return: the decompressed content, as bytes
+    """
+    with open_decompressed(path) as fp:
+        return _read_all(fp)
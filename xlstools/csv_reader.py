@@ -4,32 +4,46 @@ try:
     # don't know how to test this in CI both with and without pandas (other than just test; pip install pandas; test again)
     import pandas as pd
 except ImportError:
-    from .pd_emulator import PandasEmulator as pd
+    pd = None
 
 
-from .xlrd_like import XlrdCellLike, XlrdSheetLike, XlrdWorkbookLike
+from .xlrd_like import XlrdCellLike, XlrdSheetLike, XlrdWorkbookLike, value_ctype, value_columns
+from .native_csv import NativeCsvSheet
+from .compressed import compression, open_decompressed
+from .sources import DATA_NAME, is_path, csv_name, as_file
 
 
-def _make_cell(val):
-    if pd.isna(val):
-        return XlrdCellLike(None)
-    return XlrdCellLike(val)
+CHUNK_ROWS = 4096  # rows per bulk read in get_rows()
 
 
 class CsvSheet(XlrdSheetLike):
     """
-    Import a CSV and interact with it like an xlrd workbook containing only one sheet.
-
-    Uses pandas to import the csv if pandas is available; otherwise, uses a minimal pandas DataFrame emulator.
+    Import a CSV with pandas and interact with it like an xlrd workbook containing only one sheet.  (Without pandas,
+    CsvWorkbook uses a NativeCsvSheet instead.)
     """
-    def __init__(self, csvfile, **kwargs):
-        name, ext = os.path.splitext(os.path.basename(csvfile))
-        if ext.lower() != '.csv':
-            print('Does not appear to be a csv: %s' % ext)
-        self._name = name
-        self._df = pd.read_csv(csvfile, **kwargs)
+    def __init__(self, csvfile, name=None, **kwargs):
+        """
+        :param csvfile: path, or CSV data: bytes-like or binary file object
+        :param name: [None] file name of the data, if it has one the data does not carry (see sources.csv_name)
+        :param kwargs: passed to pd.read_csv
+        """
+        name = csv_name(csvfile, name)
+        if name is None:
+            self._name = DATA_NAME
+        else:
+            self._name, ext = os.path.splitext(name)
+            if ext.lower() != '.csv':
+                print('Does not appear to be a csv: %s' % ext)
+        if not is_path(csvfile):
+            self._df = pd.read_csv(as_file(csvfile), **kwargs)
+        elif compression(csvfile) is None:
+            self._df = pd.read_csv(csvfile, **kwargs)
+        else:
+            with open_decompressed(csvfile) as fp:
+                self._df = pd.read_csv(fp, **kwargs)
 
         self._headers = list(self._df.columns)
+        self._arrays = [None] * len(self._headers)
 
     def _find_column(self, column):
         """
@@ -55,32 +69,126 @@ class CsvSheet(XlrdSheetLike):
     def ncols(self):
         return len(self._headers)
 
+    def _array(self, col):
+        """
+        A column as a NumPy array of values convertible by tolist(), plus a boolean array marking missing values
+        (or None if there are none).  Computed once per column, so that each later slice costs no pandas overhead.
+        :param col:
+        :return:
+        """
+        if self._arrays[col] is None:
+            series = self._df.iloc[:, col]
+            values = None
+            if series.dtype.kind in 'biuf':
+                values = series.to_numpy()  # a view: tolist() gives native ints, floats, bools
+                if values.dtype != series.dtype:
+                    values = None  # a nullable type, converted with a loss (e.g. Int64 with NA to float)
+            if values is None:
+                values = series.astype(object).to_numpy()  # e.g. Timestamps and strings rather than raw datetime64
+            missing = series.isna().to_numpy() if series.hasnans else None
+            self._arrays[col] = values, missing
+        return self._arrays[col]
+
+    def _values(self, r0, r1, c0, c1):
+        """
+        Values of data rows r0 to r1 (0-based, i.e. sheet rows r0 + 1 to r1 + 1) and columns c0 to c1, by column,
+        with missing values as None.  Each column is sliced as a whole and its missing values are found from a mask
+        computed once for the column.
+        :param r0:
+        :param r1:
+        :param c0:
+        :param c1:
+        :return: list of value lists
+        """
+        columns = []
+        for j in range(c0, c1):
+            values, missing = self._array(j)
+            col = values[r0:r1].tolist()
+            if missing is not None:
+                for i in missing[r0:r1].nonzero()[0].tolist():
+                    col[i] = None
+            columns.append(col)
+        return columns
+
+    def read_columns(self, r0, r1, c0, c1):
+        """
+        Row 0 is the header; sheet row r is data row r - 1
+        """
+        r0, r1, c0, c1 = self._clamp_block(r0, r1, c0, c1)
+        if r1 <= r0:
+            return value_columns([], max(c1 - c0, 0))
+        columns = self._values(max(r0 - 1, 0), r1 - 1, c0, c1)
+        if r0 == 0:
+            columns = [[None if pd.isna(h) else h] + k for h, k in zip(self._headers[c0:c1], columns)]
+        return columns, [bytes(map(value_ctype, k)) for k in columns]
+
+    def iter_columns(self, r0, r1, c0, c1, batch_rows):
+        r0, r1, c0, c1 = self._clamp_block(r0, r1, c0, c1)
+        for r in range(r0, r1, batch_rows):
+            yield self.read_columns(r, min(r + batch_rows, r1), c0, c1)
+
+    def read_block(self, r0, r1, c0, c1):
+        """
+        Row 0 is the header; sheet row r is data row r - 1
+        """
+        r0, r1, c0, c1 = self._clamp_block(r0, r1, c0, c1)
+        values, ctypes = self.read_columns(r0, r1, c0, c1)
+        if r1 <= r0:
+            return []
+        if c1 <= c0:
+            return [[] for _ in range(r0, r1)]
+        return [list(map(XlrdCellLike, v, t)) for v, t in zip(zip(*values), zip(*ctypes))]
+
     def row(self, row):
-        if row == 0:
-            return [_make_cell(k) for k in self._headers]
-        else:
-            return [_make_cell(c) for c in self._df.loc[row - 1]]
+        if row < 0:
+            row += self.nrows
+        if not 0 <= row < self.nrows:
+            raise IndexError(row)
+        return self.read_block(row, row + 1, 0, self.ncols)[0]
 
     def col(self, col):
-        f = self._find_column(col)
-        return [_make_cell(f)] + [_make_cell(c) for c in self._df[f]]
+        j = self._headers.index(self._find_column(col))
+        values, ctypes = self.read_columns(0, self.nrows, j, j + 1)
+        return list(map(XlrdCellLike, values[0], ctypes[0]))
 
     def cell(self, row, col):
         return self.row(row)[col]
 
     def get_rows(self):
-        for i in range(self.nrows):
-            yield self.row(i)
+        for r in range(0, self.nrows, CHUNK_ROWS):
+            yield from self.read_block(r, r + CHUNK_ROWS, 0, self.ncols)
 
 
 class CsvWorkbook(XlrdWorkbookLike):
-    def __init__(self, csvfile, **kwargs):
-        self._csvfile = csvfile
-        self._xl = CsvSheet(csvfile, **kwargs)
+    def __init__(self, csvfile, engine=None, parallel=False, max_workers=None, name=None, **kwargs):
+        """
+        :param csvfile: path, or CSV data: bytes-like or binary file object
+        :param engine: [None] 'pandas' (the default if pandas is installed) to read with pd.read_csv; 'native' for a
+         NativeCsvSheet, streamed from the file with the standard library's csv module
+        :param parallel: [False] native engine only (the default engine then): parse the file in a pool of worker
+         processes (see NativeCsvSheet)
+        :param max_workers: [None] size of the process pool; default is the number of CPUs
+        :param name: [None] for data: its file name, if the data does not carry one
+        :param kwargs: passed to pd.read_csv, or to NativeCsvSheet (encoding, na_values, index, csv.reader format
+         parameters)
+        """
+        self._filename = csv_name(csvfile, name)
+        if engine is None:
+            engine = 'native' if pd is None or parallel else 'pandas'
+        if engine == 'pandas':
+            if pd is None:
+                raise ImportError('pandas is not installed; use engine="native"')
+            if parallel:
+                raise ValueError('parallel parsing requires engine="native"')
+            self._xl = CsvSheet(csvfile, name=name, **kwargs)
+        elif engine == 'native':
+            self._xl = NativeCsvSheet(csvfile, parallel=parallel, max_workers=max_workers, name=name, **kwargs)
+        else:
+            raise ValueError('Unknown engine %s' % engine)
 
     @property
     def filename(self):
-        return os.path.basename(self._csvfile)
+        return self._filename
 
     def sheet_names(self):
         return [self._xl.name]
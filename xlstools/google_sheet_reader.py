@@ -8,7 +8,7 @@ except ImportError:
     discovery = HttpError = ServiceAccountCredentials = None
 
 
-from .xlrd_like import XlrdCellLike, XlrdSheetLike, XlrdWriteWorkbook
+from .xlrd_like import XlrdCellLike, XlrdSheetLike, XlrdWriteWorkbook, XL_CELL_NUMBER, XL_CELL_TEXT
 from .util import colnum_to_col
 
 import time
@@ -19,16 +19,18 @@ class GoogleSheetError(Exception):
 
 
 class GSheetCell(XlrdCellLike):
-    def __init__(self, str_value):
+    """
+    Interprets a google sheets string value as a cell: blank, number, or string
+    """
+    __slots__ = ()
+
+    def __new__(cls, str_value):
         if len(str_value) == 0:
-            value = None
-        else:
-            # detect type: either blank, number, or string
-            try:
-                value = float(str_value)
-            except (TypeError, ValueError):
-                value = str_value
-        super(GSheetCell, self).__init__(value)
+            return super(GSheetCell, cls).__new__(cls, None)
+        try:
+            return super(GSheetCell, cls).__new__(cls, float(str_value), XL_CELL_NUMBER)
+        except (TypeError, ValueError):
+            return super(GSheetCell, cls).__new__(cls, str_value, XL_CELL_TEXT)
 
 
 class GSheetEmulator(XlrdSheetLike):
@@ -91,6 +93,16 @@ class GSheetEmulator(XlrdSheetLike):
     def cell(self, row, col):
         return GSheetCell(self._data[row][col])
 
+    def read_block(self, r0, r1, c0, c1):
+        r0, r1, c0, c1 = self._clamp_block(r0, r1, c0, c1)
+        width = max(c1 - c0, 0)
+        block = []
+        for values in self._data[r0:r1]:
+            cells = [GSheetCell(k) for k in values[c0:c1]]
+            cells.extend([GSheetCell('')] * (width - len(cells)))
+            block.append(cells)
+        return block
+
 
 class GoogleSheetReader(XlrdWriteWorkbook):
     """
@@ -187,6 +199,7 @@ class GoogleSheetReader(XlrdWriteWorkbook):
                                                    body=body)
         ret = req.execute()
         self._sheetnames = self.sheet_names()
+        self._names_version += 1
         return ret
 
     def write_to_sheet(self, sheet, range, data, **kwargs):
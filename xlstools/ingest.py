@@ -0,0 +1,136 @@
+"""
+Batch ingestion of a directory of spreadsheets.
+
+Files are farmed out to a pool of worker processes, each of which opens one file with XlReader and sends back the
+data rows of the requested sheet(s).  Results are generated as they finish, not in file order.  At most max_pending
+files are in flight (submitted but not yet handed back) at any time, so memory stays bounded however many files
+there are.  A file that fails does not stop the batch: its error is recorded in the failures report.  Neither does a
+worker process that dies (e.g. killed for using too much memory): every file then in flight is recorded as failed, as
+there is no telling which one killed it, and the rest go to a new pool.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+from itertools import chain
+
+from .xl_reader import XlReader
+
+
+def _ingest_file(path, sheet, reader_args, rowdict):
+    """
+    Worker: read one file
+    :param path:
+    :param sheet: name or index; None for every sheet
+    :param reader_args: passed to XlReader (including XlSheet options)
+    :param rowdict:
+    :return: list of (sheet name, rows)
+    """
+    with XlReader(path, **reader_args) as xl:
+        sheets = xl.sheets() if sheet is None else [xl[sheet]]
+        return [(s.name, [row for _, row in s.gen_rows(rowdict=rowdict)]) for s in sheets]
+
+
+def _describe(exc):
+    return '%s: %s' % (type(exc).__name__, exc)
+
+
+class Ingest(object):
+    """
+    Iterate to get (path, sheet name, rows) tuples as files finish.  After (or during) iteration, failures maps the
+    path of every file that could not be read to its error.
+    """
+    def __init__(self, paths, sheet=0, max_workers=None, max_pending=None, rowdict=False, **reader_args):
+        self._paths = paths
+        self._sheet = sheet
+        self._max_workers = max_workers
+        self._max_pending = max_pending or 2 * (max_workers or os.cpu_count() or 1)
+        self._rowdict = rowdict
+        self._args = reader_args
+        self.failures = dict()
+
+    def _serial(self):
+        for path in self._paths:
+            try:
+                result = _ingest_file(path, self._sheet, self._args, self._rowdict)
+            except Exception as e:
+                self.failures[path] = _describe(e)
+                continue
+            for name, rows in result:
+                yield path, name, rows
+
+    def _pool(self, paths):
+        """
+        Read files in a pool of worker processes, until they run out or the pool breaks
+        :param paths: iterator
+        :return: None when done; if the pool broke, an iterator of the files not yet submitted
+        """
+        pending = dict()
+        with ProcessPoolExecutor(max_workers=self._max_workers) as pool:
+            while True:
+                unsent = False
+                for path in paths:
+                    try:
+                        f = pool.submit(_ingest_file, path, self._sheet, self._args, self._rowdict)
+                    except BrokenProcessPool:
+                        paths = chain([path], paths)
+                        unsent = True
+                        break
+                    pending[f] = path
+                    if len(pending) >= self._max_pending:
+                        break
+                if not pending:
+                    return paths if unsent else None
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                broken = None
+                for f in done:
+                    path = pending.pop(f)
+                    try:
+                        result = f.result()
+                    except BrokenProcessPool as e:
+                        broken = e
+                        self.failures[path] = _describe(e)
+                        continue
+                    except Exception as e:
+                        self.failures[path] = _describe(e)
+                        continue
+                    for name, rows in result:
+                        yield path, name, rows
+                if broken is not None:
+                    for path in pending.values():
+                        self.failures[path] = _describe(broken)
+                    return paths
+
+    def __iter__(self):
+        if self._max_workers == 0:
+            yield from self._serial()
+            return
+        paths = iter(self._paths)
+        while paths is not None:
+            paths = yield from self._pool(paths)
+
+
+def ingest(directory, sheet=0, max_workers=None, max_pending=None, rowdict=False, **kwargs):
+    """
+    Read the data rows of every XLS / XLSX file in a directory (as xls_files finds them), in parallel.
+
+    >>> batch = ingest('suppliers/', sheet='Prices', row_gaps=True)
+    >>> for path, name, rows in batch:
+    ...     load(path, rows)
+    >>> batch.failures
+    {'suppliers/broken.xlsx': 'BadZipFile: File is not a zip file'}
+
+    :param directory: a directory, or an iterable of file paths
+    :param sheet: [0] sheet name or index to read from each file; None for every sheet
+    :param max_workers: [None] size of the process pool (default: number of CPUs); 0 to read the files one by one in
+     this process
+    :param max_pending: [2 * max_workers] most files in flight at once
+    :param rowdict: [False] rows as dicts keyed by header, as XlSheet.gen_rows
+    :param kwargs: passed to XlReader: engine, read_only, and XlSheet options such as strict or row_gaps
+    :return: an Ingest: iterate it for (path, sheet name, rows); then see its failures
+    """
+    if isinstance(directory, (str, os.PathLike)):
+        from . import xls_files
+        paths = xls_files(directory)
+    else:
+        paths = directory
+    return Ingest(paths, sheet=sheet, max_workers=max_workers, max_pending=max_pending, rowdict=rowdict, **kwargs)
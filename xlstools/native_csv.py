@@ -0,0 +1,558 @@
+"""
+A CSV reader in the standard library only: no pandas required.
+
+The file is memory-mapped and read once on opening, in chunks, to find its shape and the type of each column: int,
+float or bool if every value present parses as one, else str; a column with no values at all is empty.  As with
+pandas, blank lines are skipped, and the NA strings (below) count as missing.
+
+The same pass builds a row index: the byte offset of every INDEX_STRIDE-th row.  Any read then starts parsing at the
+nearest indexed row, so row(n) costs the same anywhere in the file, and only the rows touched are ever parsed and
+converted (by column, a chunk at a time).  The index can be saved next to the file, to skip the pass next time.
+
+With parallel=True the pass is split among worker processes.  The file is cut into byte ranges at row boundaries: a
+newline ends a row unless an odd number of quote characters precede it.  Each worker indexes its range and infers
+types for it; the ranges' types are then reconciled (int and float make float; anything else mixed makes str), so that
+the result is the same as a single pass.  Large read_columns() calls are split among workers in the same way, by row.
+"""
+import codecs
+import csv
+import json
+import mmap
+import os
+from array import array
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice, chain, accumulate, zip_longest
+
+from .xlrd_like import XlrdSheetLike, XlrdCellLike, value_ctype
+from .compressed import compression, read_decompressed
+from .sources import DATA_NAME, is_path, csv_name, as_buffer
+
+NA_VALUES = frozenset([  # taken from pandas._libs.parsers.py
+    '',
+    '-NaN',
+    '#N/A N/A',
+    '-1.#IND',
+    '1.#QNAN',
+    'N/A',
+    '<NA>',
+    'null',
+    'NA',
+    'NaN',
+    'nan',
+    'NULL',
+    '-nan',
+    '-1.#QNAN',
+    '#NA',
+    '1.#IND',
+    'n/a',
+    '#N/A',
+])
+
+_BOOLS = {'True': True, 'TRUE': True, 'true': True, 'False': False, 'FALSE': False, 'false': False}
+_BOOL_STRINGS = frozenset(_BOOLS)
+
+_CONVERT = {
+    None: None,
+    'int': int,
+    'float': float,
+    'bool': _BOOLS.__getitem__,
+    'str': None,
+}
+
+_CTYPE = {k: bytes([value_ctype(v)]) for k, v in [('int', 0), ('float', 0.0), ('bool', True), ('str', '')]}
+_MISSING_CTYPE = {k: v + bytes(255) for k, v in _CTYPE.items()}  # translate table: 0 (present) -> ctype, 1 -> empty
+
+# rows per chunk of the type-inference pass, and of reads: small chunks keep few row lists alive at a time, which is
+# what the garbage collector's passes cost
+INFER_ROWS = 1024
+CHUNK_ROWS = 256
+
+INDEX_STRIDE = 64  # the row index holds where every INDEX_STRIDE-th row starts: any row is at most this many away
+BLOCK_BYTES = 1 << 20  # most of the file split into lines at once
+
+PART_BYTES = 4 << 20  # parallel=True: smallest byte range given to a worker
+PARALLEL_ROWS = 65536  # parallel=True: smallest read_columns() split among workers
+
+_INDEX_MAGIC = b'XLSTOOLS-CSV-INDEX-2\n'
+
+
+def _widen(kind, values, na):
+    """
+    The narrowest column type that covers both kind and the given strings
+    :param kind: None (nothing seen yet), 'bool', 'int', 'float' or 'str'
+    :param values: sequence of strings
+    :param na: set of strings that count as missing
+    :return:
+    """
+    if kind == 'str':
+        return kind
+    if not na.isdisjoint(values):
+        values = [k for k in values if k not in na]
+        if not values:
+            return kind
+    if kind in (None, 'bool'):
+        if _BOOL_STRINGS.issuperset(values):
+            return 'bool'
+        if kind == 'bool':
+            return 'str'
+    if kind in (None, 'int'):
+        try:
+            deque(map(int, values), 0)
+            return 'int'
+        except ValueError:
+            pass
+    try:
+        deque(map(float, values), 0)
+        return 'float'
+    except ValueError:
+        return 'str'
+
+
+def _merge_kinds(a, b):
+    """
+    The column type covering two parts of a column, each with its own type from _widen
+    """
+    if a is None or a == b:
+        return b
+    if b is None:
+        return a
+    if {a, b} == {'int', 'float'}:
+        return 'float'
+    return 'str'
+
+
+def _pad(rows, width):
+    if set(map(len, rows)) <= {width}:
+        return rows
+    pad = [''] * width
+    return [k if len(k) == width else (k + pad)[:width] for k in rows]
+
+
+def _convert(values, kind, na):
+    """
+    :param values: sequence of strings
+    :param kind: column type, from _widen
+    :param na:
+    :return: list of native values (None where missing), bytes of ctypes
+    """
+    n = len(values)
+    if kind is None:
+        return [None] * n, bytes(n)
+    conv = _CONVERT[kind]
+    if na.isdisjoint(values):
+        return list(values) if conv is None else list(map(conv, values)), _CTYPE[kind] * n
+    ctypes = bytes(map(na.__contains__, values)).translate(_MISSING_CTYPE[kind])
+    if conv is None:
+        return [None if k in na else k for k in values], ctypes
+    return [None if k in na else conv(k) for k in values], ctypes
+
+
+def _iter_blocks(mm, st, en=None):
+    """
+    The lines of a mapped file from byte offset st, as lists of bytes, a block at a time.  Blocks end at a newline,
+    and grow from 16 KiB to BLOCK_BYTES, so that reading a few rows splits little of the file.
+    :param mm: mmap (or bytes)
+    :param st:
+    :param en: [None] stop at this offset (which should follow a newline) rather than the end of the file
+    :return: generates (offset of block, lines)
+    """
+    n = len(mm) if en is None else en
+    size = 16384
+    while st < n:
+        e = mm.find(b'\n', min(st + size, n) - 1, n)
+        e = n if e < 0 else e + 1
+        yield st, mm[st:e].splitlines(keepends=True)
+        st = e
+        size = min(size * 2, BLOCK_BYTES)
+
+
+def _scan_range(mm, st, en, decode, fmt, na, header):
+    """
+    One pass over bytes st to en of a mapped file: count rows and columns, infer column types, and note where every
+    INDEX_STRIDE-th row starts.  Rows are found by csv.reader (so quoted newlines are handled); where a row starts is
+    known from the reader's line count.
+    :param mm:
+    :param st:
+    :param en: None for the end of the file
+    :param decode: bytes -> str
+    :param fmt: csv.reader format parameters
+    :param na: strings that count as missing
+    :param header: whether the first row is the header, left out of type inference
+    :return: offsets of rows 0, INDEX_STRIDE, 2 * INDEX_STRIDE, ...; number of rows; number of columns; column kinds
+    """
+    where = [0, [st]]  # first line number of the current block; offsets of its lines, and of its end
+
+    def _lines():
+        first = 0
+        for b, lines in _iter_blocks(mm, st, en):
+            where[0], where[1] = first, list(accumulate(map(len, lines), initial=b))
+            first += len(lines)
+            yield from map(decode, lines)
+
+    reader = csv.reader(_lines(), **fmt)
+    rows = filter(None, reader)
+    offsets = array('q')
+    n = 0
+    width = 0
+    kinds = []
+    pending = []
+
+    def _infer(chunk, width):
+        kinds.extend([None] * (width - len(kinds)))
+        for j, values in enumerate(zip(*_pad(chunk, width))):
+            kinds[j] = _widen(kinds[j], values, na)
+
+    while True:
+        b = where[1][reader.line_num - where[0]]
+        chunk = list(islice(rows, INDEX_STRIDE))
+        if not chunk:
+            break
+        offsets.append(b)
+        width = max(width, max(map(len, chunk)))
+        pending.extend(chunk[1:] if header and not n else chunk)
+        n += len(chunk)
+        if len(pending) >= INFER_ROWS:
+            _infer(pending, width)
+            pending = []
+    if pending:
+        _infer(pending, width)
+    kinds.extend([None] * (width - len(kinds)))
+    return offsets, n, width, kinds
+
+
+def _count(mm, sub, st, en):
+    return sum(mm[i:min(i + BLOCK_BYTES, en)].count(sub) for i in range(st, en, BLOCK_BYTES))
+
+
+def _split(mm, st, parts, quote):
+    """
+    Cut bytes st to the end of a mapped file into about `parts` ranges of whole rows, none under PART_BYTES.  A newline
+    inside a quoted field is preceded by an odd number of quote characters; any other newline ends a row.  (This holds
+    for files that quote fields the standard way, doubling quote characters inside them.)
+    :param mm:
+    :param st:
+    :param parts:
+    :param quote: the quote character, as bytes; None if fields are never quoted
+    :return: list of offsets, from st to the end of the file
+    """
+    n = len(mm)
+    size = max((n - st) // parts, PART_BYTES)
+    bounds = [st]
+    pos = st
+    odd = 0
+    while bounds[-1] + size < n:
+        target = bounds[-1] + size
+        if quote:
+            odd ^= _count(mm, quote, pos, target) & 1
+        pos = target
+        while True:
+            nl = mm.find(b'\n', pos)
+            if nl < 0:
+                return bounds + [n]
+            if quote:
+                odd ^= _count(mm, quote, pos, nl) & 1
+            pos = nl + 1
+            if not odd:
+                break
+        if pos >= n:
+            break
+        bounds.append(pos)
+    return bounds + [n]
+
+
+def _map(path):
+    """
+    The file's bytes: memory-mapped, or for a compressed file, decompressed into memory.  Data (not a path) is used
+    as it is, where it can be (see sources.as_buffer).
+    """
+    if not is_path(path):
+        return as_buffer(path)
+    if compression(path) is not None:
+        return read_decompressed(path)
+    with open(path, 'rb') as fp:
+        try:
+            return mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            return b''
+
+
+def _scan_part(path, st, en, encoding, fmt, na, header):
+    """
+    Worker for NativeCsvSheet(parallel=True): _scan_range on a range of the file
+    """
+    return _scan_range(_map(path), st, en, partial(str, encoding=encoding), fmt, na, header)
+
+
+def _read_part(sheet, r0, r1, c0, c1):
+    """
+    Worker for NativeCsvSheet(parallel=True): read_columns in a single process
+    """
+    return XlrdSheetLike.read_columns(sheet, r0, r1, c0, c1)
+
+
+class NativeCsvSheet(XlrdSheetLike):
+    def __init__(self, csvfile, encoding=None, na_values=None, keep_default_na=True, index=None, parallel=False,
+                 max_workers=None, name=None, **fmtparams):
+        """
+        :param csvfile: path; a compressed file (see compressed.py) is decompressed into memory instead of mapped.
+         Or CSV data: bytes-like or binary file object (paths only: index, parallel)
+        :param encoding: [None] the file's encoding (UTF-8 if None); must be ASCII-compatible
+        :param na_values: [None] more strings to count as missing
+        :param keep_default_na: [True] also count NA_VALUES as missing (as pandas)
+        :param index: [None] path of a file to keep the row index (and column types) in, or True for the csv path
+         plus '.index'.  It is loaded if it matches the csv file (size, mtime and reading options), else built and
+         saved.  Default: build it in memory.
+        :param parallel: [False] build the index, and do large read_columns() calls, in a pool of worker processes.
+         Files with an escapechar (or doublequote=False) are indexed in a single pass, as their rows cannot be found
+         by counting quotes, as are compressed files.
+        :param max_workers: [None] size of the process pool; default is the number of CPUs
+        :param name: [None] for data: its file name, if the data does not carry one
+        :param fmtparams: passed to csv.reader: delimiter, quotechar, etc.
+        """
+        self._file = csvfile
+        name = csv_name(csvfile, name)
+        self._name = DATA_NAME if name is None else os.path.splitext(name)[0]
+        self._encoding = encoding or 'utf-8'
+        self._fmt = fmtparams
+        na = set(NA_VALUES) if keep_default_na else set()
+        if na_values:
+            na.update([na_values] if isinstance(na_values, str) else na_values)
+        self._na = frozenset(na)
+        self._decode = partial(str, encoding=self._encoding)
+        self._mm = _map(csvfile)
+        # workers map the file themselves: there is none for data, and they would each decompress a compressed file
+        self._parallel = parallel and is_path(csvfile) and isinstance(self._mm, mmap.mmap)
+        self._max_workers = max_workers
+        self._start = 0
+        if self._mm[:3] == codecs.BOM_UTF8 and codecs.lookup(self._encoding).name.startswith('utf-8'):
+            self._start = 3
+
+        if index is not None and not is_path(csvfile):
+            raise ValueError('index requires a path')
+        if index is True:
+            index = os.fspath(csvfile) + '.index'
+        if index is None or not self._load_index(index):
+            if self._parallel:
+                self._scan_parallel()
+            else:
+                self._scan()
+            if index is not None:
+                self._save_index(index)
+        self._headers = next(self._rows(self._start), []) if self._nrows else []
+
+    def _rows(self, st):
+        """
+        Rows of strings from byte offset st of the file, blank lines skipped
+        """
+        lines = chain.from_iterable(k for _, k in _iter_blocks(self._mm, st))
+        return filter(None, csv.reader(map(self._decode, lines), **self._fmt))
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_mm']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._mm = _map(self._file)
+
+    def _set_index(self, rows, offsets, nrows, ncols, kinds):
+        self._index_rows = rows  # row numbers, each with the offset where it starts
+        self._offsets = offsets
+        self._nrows = nrows
+        self._ncols = ncols
+        self._kinds = kinds
+
+    def _scan(self):
+        offsets, n, width, kinds = _scan_range(self._mm, self._start, None, self._decode, self._fmt, self._na, True)
+        self._set_index(array('q', range(0, n, INDEX_STRIDE)), offsets, n, width, kinds)
+
+    def _workers(self):
+        return self._max_workers or os.cpu_count() or 1
+
+    def _scan_parallel(self):
+        """
+        _scan, with the file split among worker processes at row boundaries.  Each range is indexed from its own first
+        row; the ranges' column types are merged.
+        """
+        dialect = csv.reader([], **self._fmt).dialect
+        if dialect.escapechar is not None or not dialect.doublequote:
+            return self._scan()
+        quote = None
+        if dialect.quoting != csv.QUOTE_NONE and dialect.quotechar:
+            quote = dialect.quotechar.encode(self._encoding)
+        bounds = _split(self._mm, self._start, self._workers(), quote)
+        if len(bounds) < 3:
+            return self._scan()
+        with ProcessPoolExecutor(max_workers=self._max_workers) as pool:
+            futures = [pool.submit(_scan_part, self._file, st, en, self._encoding, self._fmt, self._na, i == 0)
+                       for i, (st, en) in enumerate(zip(bounds, bounds[1:]))]
+            rows, offsets = array('q'), array('q')
+            n = width = 0
+            kinds = []
+            for f in futures:
+                part_offsets, part_rows, part_width, part_kinds = f.result()
+                rows.extend(range(n, n + part_rows, INDEX_STRIDE))
+                offsets.extend(part_offsets)
+                n += part_rows
+                width = max(width, part_width)
+                kinds = [_merge_kinds(a, b) for a, b in zip_longest(kinds, part_kinds)]
+        self._set_index(rows, offsets, n, width, kinds)
+
+    def _index_key(self):
+        st = os.stat(self._file)
+        return repr((st.st_size, st.st_mtime_ns, self._encoding, sorted(self._fmt.items()), sorted(self._na),
+                     INDEX_STRIDE))
+
+    def _load_index(self, path):
+        """
+        :param path:
+        :return: True if the index was loaded; False if it is missing or stale
+        """
+        try:
+            with open(path, 'rb') as fp:
+                if fp.readline() != _INDEX_MAGIC:
+                    return False
+                header = json.loads(fp.readline())
+                if header['key'] != self._index_key():
+                    return False
+                rows, offsets = array('q'), array('q')
+                rows.fromfile(fp, header['entries'])
+                offsets.fromfile(fp, header['entries'])
+        except (OSError, ValueError, KeyError, EOFError):
+            return False
+        self._set_index(rows, offsets, header['nrows'], header['ncols'], header['kinds'])
+        return True
+
+    def _save_index(self, path):
+        header = {'key': self._index_key(), 'kinds': self._kinds, 'nrows': self._nrows, 'ncols': self._ncols,
+                  'entries': len(self._offsets)}
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as fp:
+            fp.write(_INDEX_MAGIC)
+            fp.write(json.dumps(header).encode() + b'\n')
+            fp.write(self._index_rows.tobytes())
+            fp.write(self._offsets.tobytes())
+        os.replace(tmp, path)
+
+    @property
+    def kinds(self):
+        """
+        The inferred type of each column: 'int', 'float', 'bool', 'str', or None for a column with no values
+        :return:
+        """
+        return list(self._kinds)
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def nrows(self):
+        return self._nrows
+
+    @property
+    def ncols(self):
+        return self._ncols
+
+    def _batch_columns(self, batch, r, c0, c1):
+        """
+        :param batch: rows of strings, sheet rows r, r + 1, ...
+        :param r:
+        :param c0:
+        :param c1:
+        :return: values and ctypes by column
+        """
+        width = c1 - c0
+        header = None
+        if r == 0 and batch:
+            header = [k or None for k in (batch[0][c0:c1] + [''] * width)[:width]]
+            batch = batch[1:]
+        if batch:
+            columns = islice(zip(*_pad(batch, self._ncols)), c0, c1)
+            values, ctypes = zip(*[_convert(v, self._kinds[j], self._na) for j, v in zip(range(c0, c1), columns)])
+            values, ctypes = list(values), list(ctypes)
+        else:
+            values, ctypes = [[] for _ in range(width)], [b''] * width
+        if header is not None:
+            values = [[h] + v for h, v in zip(header, values)]
+            ctypes = [bytes([value_ctype(h)]) + t for h, t in zip(header, ctypes)]
+        return values, ctypes
+
+    def iter_columns(self, r0, r1, c0, c1, batch_rows):
+        """
+        Parsing starts at the nearest indexed row at or before r0
+        """
+        r0, r1, c0, c1 = self._clamp_block(r0, r1, c0, c1)
+        if r1 <= r0:
+            return
+        k = bisect_right(self._index_rows, r0) - 1
+        skip = r0 - self._index_rows[k]
+        rows = islice(self._rows(self._offsets[k]), skip, skip + r1 - r0)
+        for r in range(r0, r1, batch_rows):
+            yield self._batch_columns(list(islice(rows, batch_rows)), r, c0, c1)
+
+    def read_columns(self, r0, r1, c0, c1):
+        """
+        With parallel=True, a block of more than PARALLEL_ROWS rows is split by row among worker processes
+        """
+        r0, r1, c0, c1 = self._clamp_block(r0, r1, c0, c1)
+        if not self._parallel or r1 - r0 < PARALLEL_ROWS or self._workers() < 2:
+            return XlrdSheetLike.read_columns(self, r0, r1, c0, c1)
+        step = -(-(r1 - r0) // self._workers())
+        values = [[] for _ in range(c0, c1)]
+        ctypes = [bytearray() for _ in range(c0, c1)]
+        with ProcessPoolExecutor(max_workers=self._max_workers) as pool:
+            futures = [pool.submit(_read_part, self, r, min(r + step, r1), c0, c1) for r in range(r0, r1, step)]
+            for f in futures:
+                part_values, part_ctypes = f.result()
+                for v, t, pv, pt in zip(values, ctypes, part_values, part_ctypes):
+                    v.extend(pv)
+                    t.extend(pt)
+        return values, [bytes(t) for t in ctypes]
+
+    @staticmethod
+    def _cell_rows(values, ctypes):
+        if not values:
+            return []
+        return [list(map(XlrdCellLike, v, t)) for v, t in zip(zip(*values), zip(*ctypes))]
+
+    def read_block(self, r0, r1, c0, c1):
+        r0, r1, c0, c1 = self._clamp_block(r0, r1, c0, c1)
+        if c1 <= c0:
+            return [[] for _ in range(r0, r1)]
+        block = []
+        for values, ctypes in self.iter_columns(r0, r1, c0, c1, CHUNK_ROWS):
+            block.extend(self._cell_rows(values, ctypes))
+        return block
+
+    def get_rows(self):
+        for values, ctypes in self.iter_columns(0, self._nrows, 0, self._ncols, CHUNK_ROWS):
+            yield from self._cell_rows(values, ctypes)
+
+    def row(self, row):
+        if row < 0:
+            row += self._nrows
+        if not 0 <= row < self._nrows:
+            raise IndexError(row)
+        return self.read_block(row, row + 1, 0, self._ncols)[0]
+
+    def col(self, col):
+        """
+        :param col: index, or header
+        :return:
+        """
+        if not isinstance(col, int):
+            col = self._headers.index(col)
+        elif col < 0:
+            col += self._ncols
+        if not 0 <= col < self._ncols:
+            raise IndexError(col)
+        values, ctypes = self.read_columns(0, self._nrows, col, col + 1)
+        return list(map(XlrdCellLike, values[0], ctypes[0]))
+
+    def cell(self, row, col):
+        return self.row(row)[col]
@@ -0,0 +1,365 @@
+"""
+A native XLSX reader: worksheet XML is parsed straight out of the zip archive with ElementTree's iterparse, without
+building openpyxl's workbook / cell object model.  Only cached values are read (as openpyxl does with data_only=True);
+formulas are never evaluated.
+
+Values are interpreted exactly as openpyxl interprets them-- shared and inline strings, ints vs floats, booleans,
+error strings, and date-formatted numbers converted to datetimes-- so that NativeXlsxWorkbook is a drop-in, faster
+replacement for OpenpyXlrdWorkbook when reading.  openpyxl's own number-format and date helpers are used for the
+conversions.
+"""
+import os
+import posixpath
+import zipfile
+from xml.etree.ElementTree import iterparse, fromstring
+
+from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format, is_timedelta_format
+from openpyxl.utils.datetime import from_excel, from_ISO8601, WINDOWS_EPOCH, CALENDAR_MAC_1904
+
+from .xlrd_like import XlrdCellLike, XlrdSheetLike, XlrdWorkbookLike, EMPTY_CELL, value_columns
+from .util import col_to_colnum
+
+
+_MAIN_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_DOC_REL_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+_PKG_REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+_ROW = _MAIN_NS + 'row'
+_CELL = _MAIN_NS + 'c'
+_VALUE = _MAIN_NS + 'v'
+_INLINE = _MAIN_NS + 'is'
+_TEXT = _MAIN_NS + 't'
+_RUN = _MAIN_NS + 'r'
+_SI = _MAIN_NS + 'si'
+
+
+def _cast_number(value):
+    """
+    as openpyxl: ints stay ints
+    """
+    if '.' in value or 'E' in value or 'e' in value:
+        return float(value)
+    return int(value)
+
+
+def _text_content(node):
+    """
+    Plain text of a string item: its own <t> plus the <t> of every rich-text run, ignoring phonetic runs
+    :param node: an <si> or <is> element
+    :return:
+    """
+    snippets = []
+    for child in node:
+        if child.tag == _TEXT:
+            if child.text is not None:
+                snippets.append(child.text)
+        elif child.tag == _RUN:
+            t = child.find(_TEXT)
+            if t is not None and t.text is not None:
+                snippets.append(t.text)
+    return ''.join(snippets)
+
+
+_COLUMNS = dict()
+
+
+def _ref_col(ref):
+    """
+    'AB12' -> 27, the 0-indexed column of a cell reference.  Column letters are memoized since every row repeats them
+    :param ref:
+    :return:
+    """
+    letters = ref.rstrip('0123456789')
+    try:
+        return _COLUMNS[letters]
+    except KeyError:
+        _COLUMNS[letters] = col = col_to_colnum(letters)
+        return col
+
+
+def _read_rels(archive, part):
+    """
+    Returns a dict of relationship Id -> (Type, archive path of target) for the given part
+    :param archive:
+    :param part:
+    :return:
+    """
+    folder, fname = posixpath.split(part)
+    rels_part = posixpath.join(folder, '_rels', fname + '.rels')
+    try:
+        root = fromstring(archive.read(rels_part))
+    except KeyError:
+        return dict()
+    rels = dict()
+    for rel in root.iter(_PKG_REL_NS + 'Relationship'):
+        target = rel.get('Target')
+        if target.startswith('/'):
+            target = target[1:]
+        else:
+            target = posixpath.normpath(posixpath.join(folder, target))
+        rels[rel.get('Id')] = (rel.get('Type'), target)
+    return rels
+
+
+def _find_rel(rels, rel_type):
+    for typ, target in rels.values():
+        if typ.endswith('/' + rel_type):
+            return target
+    return None
+
+
+class NativeXlsxSheet(XlrdSheetLike):
+    """
+    A parsed worksheet.  Rows are stored as lists of native values, trimmed to their last non-empty cell.
+    """
+    def __init__(self, name, rows):
+        self._name = name
+        self._rows = rows
+        self._nrows = len(rows)
+        self._ncols = max((len(k) for k in rows), default=0)
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def nrows(self):
+        return self._nrows
+
+    @property
+    def ncols(self):
+        return self._ncols
+
+    def _pad(self, values, n=None):
+        if n is None:
+            n = self._ncols
+        return [XlrdCellLike(k) for k in values] + [EMPTY_CELL] * (n - len(values))
+
+    def row(self, row):
+        if row >= self._nrows:
+            raise IndexError
+        return self._pad(self._rows[row])
+
+    def get_rows(self):
+        for values in self._rows:
+            yield self._pad(values)
+
+    def col(self, col):
+        """
+        negative index counts from ncols, per xlrd
+        :param col:
+        :return:
+        """
+        if col < 0:
+            col += self._ncols
+        if col >= self._ncols:
+            raise IndexError
+        return [XlrdCellLike(k[col] if col < len(k) else None) for k in self._rows]
+
+    def read_block(self, r0, r1, c0, c1):
+        r0, r1, c0, c1 = self._clamp_block(r0, r1, c0, c1)
+        width = max(c1 - c0, 0)
+        return [self._pad(values[c0:c1], width) for values in self._rows[r0:r1]]
+
+    def read_columns(self, r0, r1, c0, c1):
+        r0, r1, c0, c1 = self._clamp_block(r0, r1, c0, c1)
+        width = max(c1 - c0, 0)
+        pad = [None] * width
+        return value_columns([k + pad[len(k):] for k in (values[c0:c1] for values in self._rows[r0:r1])], width)
+
+    def cell(self, row, col):
+        if row >= self._nrows or col >= self._ncols:
+            raise IndexError
+        values = self._rows[row]
+        return XlrdCellLike(values[col] if col < len(values) else None)
+
+
+class NativeXlsxWorkbook(XlrdWorkbookLike):
+    """
+    Read an XLSX file directly from its zip archive.
+    """
+    @classmethod
+    def from_file(cls, file, **kwargs):
+        return cls(file, **kwargs)
+
+    def __init__(self, file):
+        """
+        :param file: path or binary file object of an XLSX archive
+        """
+        self._file = file
+        self._shared_strings = None
+        with zipfile.ZipFile(file) as archive:
+            self._read_workbook(archive)
+        self._sheets = [None] * len(self._sheet_names)
+
+    def _sheet(self, index):
+        """
+        Sheets are parsed on first access; only that sheet's part is decompressed (plus, once, the shared strings
+        and styles that every sheet depends on)
+        :param index:
+        :return:
+        """
+        sheet = self._sheets[index]
+        if sheet is None:
+            with zipfile.ZipFile(self._file) as archive:
+                if self._shared_strings is None:
+                    self._shared_strings = self._read_shared_strings(archive)
+                    self._date_styles, self._timedelta_styles = self._read_styles(archive)
+                sheet = NativeXlsxSheet(self._sheet_names[index], self._read_sheet(archive, self._sheet_parts[index]))
+            self._sheets[index] = sheet
+        return sheet
+
+    def _read_workbook(self, archive):
+        root_rels = _read_rels(archive, '')
+        wb_part = _find_rel(root_rels, 'officeDocument') or 'xl/workbook.xml'
+        self._rels = _read_rels(archive, wb_part)
+        root = fromstring(archive.read(wb_part))
+
+        pr = root.find(_MAIN_NS + 'workbookPr')
+        if pr is not None and pr.get('date1904') in ('1', 'true'):
+            self._epoch = CALENDAR_MAC_1904
+        else:
+            self._epoch = WINDOWS_EPOCH
+
+        self._sheet_names = []
+        self._sheet_parts = []
+        self._names = dict()
+        for sheet in root.iter(_MAIN_NS + 'sheet'):
+            typ, target = self._rels[sheet.get(_DOC_REL_NS + 'id')]
+            if not typ.endswith('/worksheet'):
+                continue  # chartsheets, dialogsheets
+            self._names[sheet.get('name')] = len(self._sheet_names)
+            self._sheet_names.append(sheet.get('name'))
+            self._sheet_parts.append(target)
+
+    def _read_shared_strings(self, archive):
+        part = _find_rel(self._rels, 'sharedStrings')
+        if part is None:
+            return []
+        strings = []
+        with archive.open(part) as fp:
+            for _, node in iterparse(fp):
+                if node.tag == _SI:
+                    strings.append(_text_content(node).replace('x005F_', ''))
+                    node.clear()
+        return strings
+
+    def _read_styles(self, archive):
+        """
+        Returns sets of cell style indices that carry date and timedelta number formats.  The indices are kept as
+        strings, for direct comparison with the 's' attribute of a cell
+        :param archive:
+        :return:
+        """
+        date_styles = set()
+        timedelta_styles = set()
+        part = _find_rel(self._rels, 'styles')
+        if part is None:
+            return date_styles, timedelta_styles
+        root = fromstring(archive.read(part))
+        custom = {int(k.get('numFmtId')): k.get('formatCode') for k in root.iter(_MAIN_NS + 'numFmt')}
+        xfs = root.find(_MAIN_NS + 'cellXfs')
+        if xfs is None:
+            return date_styles, timedelta_styles
+        for idx, xf in enumerate(xfs.iter(_MAIN_NS + 'xf')):
+            fmt_id = int(xf.get('numFmtId', 0))
+            fmt = custom.get(fmt_id, BUILTIN_FORMATS.get(fmt_id))
+            if is_date_format(fmt):
+                date_styles.add(str(idx))
+            if is_timedelta_format(fmt):
+                timedelta_styles.add(str(idx))
+        return date_styles, timedelta_styles
+
+    def _value(self, c):
+        """
+        Interpret a <c> element as openpyxl does with data_only=True
+        :param c:
+        :return:
+        """
+        t = c.get('t', 'n')
+        if t == 'inlineStr':
+            node = c.find(_INLINE)
+            if node is None:
+                return None
+            return _text_content(node)
+        value = c.findtext(_VALUE) or None
+        if value is None:
+            return None
+        if t == 'n':
+            value = _cast_number(value)
+            s = c.get('s')
+            if s in self._date_styles:
+                try:
+                    return from_excel(value, self._epoch, timedelta=s in self._timedelta_styles)
+                except (OverflowError, ValueError):
+                    return '#VALUE!'
+            return value
+        if t == 's':
+            return self._shared_strings[int(value)]
+        if t == 'b':
+            return bool(int(value))
+        if t == 'd':
+            return from_ISO8601(value)
+        return value  # 'str' and 'e'
+
+    def _read_sheet(self, archive, part):
+        """
+        Stream a worksheet part into a list of value lists, dropping trailing empty cells and rows
+        :param archive:
+        :param part:
+        :return:
+        """
+        rows = []
+        row_i = -1
+        _value = self._value
+        with archive.open(part) as fp:
+            for _, node in iterparse(fp):
+                if node.tag != _ROW:
+                    continue
+                r = node.get('r')
+                row_i = int(r) - 1 if r else row_i + 1
+                values = []
+                col_i = -1
+                for c in node.iter(_CELL):
+                    ref = c.get('r')
+                    if ref:
+                        col_i = _ref_col(ref)
+                    else:
+                        col_i += 1
+                    value = _value(c)
+                    if value is None:
+                        continue
+                    if col_i > len(values):
+                        values.extend([None] * (col_i - len(values)))
+                        values.append(value)
+                    elif col_i == len(values):
+                        values.append(value)
+                    else:
+                        values[col_i] = value
+                node.clear()
+                if values:
+                    if row_i >= len(rows):
+                        rows.extend([] for _ in range(len(rows), row_i + 1))
+                    rows[row_i] = values
+        return rows
+
+    @property
+    def filename(self):
+        if isinstance(self._file, str):
+            return os.path.basename(self._file)
+        return 'native-xlsx-workbook'
+
+    def sheet_names(self):
+        return list(self._sheet_names)
+
+    def sheet_by_name(self, name):
+        return self._sheet(self._names[name])
+
+    def sheet_by_index(self, index):
+        return self._sheet(index)
+
+    def sheets(self):
+        return [self._sheet(i) for i in range(len(self._sheets))]
+
+    def unload_sheet(self, sheet_name_or_index):
+        self._sheets[self._sheet_index(sheet_name_or_index)] = None
@@ -0,0 +1,275 @@
+"""
+Occupancy profile of a sheet: which cells are non-empty.
+
+Occupancy is stored as bytes with one byte per cell (1 = non-empty).  Row and column questions-- fill counts, first
+non-empty cell, contiguous runs, next empty cell-- are answered by slicing and searching those bytes, without going
+back to the sheet.
+
+A profile is filled in one of two ways:
+ - swept: the whole bitmap is built with a single pass over the sheet's rows.  This is used when a pass is cheap
+   (the sheet is backed by a ValueGrid) or unavoidable (the sheet can only be streamed, so every row() or col() call
+   would be a pass of its own).
+ - on demand: each row or column is fetched from the sheet the first time it is asked about, and never again.  For
+   random-access sheets this reads no more than the questions require-- a canonical table is answered from its first
+   row and first column.
+"""
+import re
+from array import array
+
+from .xlrd_like import iter_columns
+
+
+_NONZERO = bytes([0] + [1] * 255)  # translate table: XL_CELL_EMPTY (0) -> 0, any other ctype -> 1
+_RUN = re.compile(b'\x01+')
+SWEEP_ROWS = 256  # rows per batch when sweeping a streamed sheet
+
+
+def _occupied(cells):
+    return bytes([c.ctype for c in cells]).translate(_NONZERO)
+
+
+class Occupancy(object):
+    """
+    Non-empty bitmap of an nrows x ncols sheet.  Rows shorter than ncols (ragged backends) are padded with empties
+    but keep their own length, for computing shares.
+    """
+    @classmethod
+    def from_sheet(cls, sheet):
+        """
+        Swept if the sheet is grid-backed or not random-access; otherwise filled on demand
+        :param sheet: an XlrdSheetLike
+        :return:
+        """
+        occ = cls(sheet)
+        if getattr(sheet, 'grid', None) is not None or not getattr(sheet, 'random_access', True):
+            occ.sweep()
+        return occ
+
+    def __init__(self, sheet):
+        self._s = sheet
+        self._nrows = sheet.nrows
+        self._ncols = sheet.ncols
+        self._bits = None
+        self._row_lengths = None
+        self._rows = dict()
+        self._cols = dict()
+        self._longest = dict()
+
+    def sweep(self):
+        """
+        Build the full bitmap: straight from a ValueGrid's ctypes if the sheet has one; else in one pass over the
+        sheet, by iter_columns() if it is streamed, else by get_rows()
+        :return:
+        """
+        nrows, ncols = self._nrows, self._ncols
+        grid = getattr(self._s, 'grid', None)
+        if grid is not None:
+            bits = bytearray(nrows * ncols)
+            for j in range(ncols):
+                bits[j::ncols] = bytes(grid.col_ctypes(j)).translate(_NONZERO)
+            lengths = None
+        elif not getattr(self._s, 'random_access', True):
+            # streamed sheets present every row padded to ncols: take their ctypes by column, without making cells
+            bits = bytearray(nrows * ncols)
+            r = 0
+            for _, ctypes in iter_columns(self._s, 0, nrows, 0, ncols, SWEEP_ROWS):
+                n = len(ctypes[0]) if ctypes else 0
+                for j, t in enumerate(ctypes):
+                    bits[r * ncols + j:(r + n) * ncols:ncols] = bytes(t).translate(_NONZERO)
+                r += n
+            lengths = None
+        else:
+            bits = bytearray()
+            lengths = array('l')
+            for row in self._s.get_rows():
+                k = _occupied(row[:ncols])
+                lengths.append(len(row))
+                bits += k
+                if len(k) < ncols:
+                    bits += bytes(ncols - len(k))
+            # pad out rows the backend did not produce
+            lengths.extend([0] * (nrows - len(lengths)))
+            bits += bytes(nrows * ncols - len(bits))
+        self._bits = bits
+        self._row_lengths = lengths
+        self._rows = dict()
+        self._cols = dict()
+
+    @property
+    def swept(self):
+        return self._bits is not None
+
+    @property
+    def nrows(self):
+        return self._nrows
+
+    @property
+    def ncols(self):
+        return self._ncols
+
+    def row(self, row):
+        """
+        :param row:
+        :return: bytes, one per column
+        """
+        try:
+            return self._rows[row][0]
+        except KeyError:
+            pass
+        if self._bits is not None:
+            st = row * self._ncols
+            b = bytes(self._bits[st:st + self._ncols])
+            length = self._ncols if self._row_lengths is None else self._row_lengths[row]
+        else:
+            cells = self._s.row(row)
+            b = _occupied(cells[:self._ncols])
+            length = len(cells)
+            if len(b) < self._ncols:
+                b += bytes(self._ncols - len(b))
+        self._rows[row] = (b, length)
+        return b
+
+    def col(self, col):
+        """
+        :param col:
+        :return: bytes, one per row
+        """
+        try:
+            return self._cols[col]
+        except KeyError:
+            pass
+        if self._bits is not None:
+            b = bytes(self._bits[col::self._ncols])
+        else:
+            b = _occupied(self._s.col(col)[:self._nrows])
+            if len(b) < self._nrows:
+                b += bytes(self._nrows - len(b))
+        self._cols[col] = b
+        return b
+
+    def occupied(self, row, col):
+        if self._bits is not None:
+            return bool(self._bits[row * self._ncols + col])
+        if col in self._cols:
+            return bool(self._cols[col][row])
+        return bool(self.row(row)[col])
+
+    def row_length(self, row):
+        self.row(row)
+        return self._rows[row][1]
+
+    def row_count(self, row):
+        return self.row(row).count(1)
+
+    def col_count(self, col):
+        return self.col(col).count(1)
+
+    def row_share(self, row):
+        """
+        Same as xl_sheet.share() applied to the row: the non-empty fraction of the row, and its first non-empty cell
+        :param row:
+        :return:
+        """
+        b = self.row(row)
+        length = self.row_length(row)
+        first = b.find(1)
+        if length == 0 or first < 0:
+            return 0.0, None
+        return b.count(1) / length, first
+
+    def col_runs(self, col):
+        """
+        Generates (starting row, run length) for each contiguous run of non-empty cells in the column, as
+        xl_sheet.chunks()
+        :param col:
+        :return:
+        """
+        for m in _RUN.finditer(self.col(col)):
+            yield m.start(), m.end() - m.start()
+
+    def longest_run(self, col):
+        """
+        Same as xl_sheet._longest() applied to the column: the first of the longest runs
+        :param col:
+        :return: (starting row, run length), or (0, 0) if the column is empty
+        """
+        try:
+            return self._longest[col]
+        except KeyError:
+            best = (0, 0)
+            for run in self.col_runs(col):
+                if run[1] > best[1]:
+                    best = run
+            self._longest[col] = best
+            return best
+
+    def last_in_col(self, col):
+        """
+        :param col:
+        :return: row index of the last non-empty cell in the column, or -1
+        """
+        return self.col(col).rfind(1)
+
+    def blocks(self):
+        """
+        Bounding boxes of the connected regions of non-empty cells, where cells touching at an edge or a corner are
+        connected.  Sweeps the sheet if it has not been swept, then makes one pass over the bitmap: each row's runs
+        are joined (union-find) to the runs they touch in the row above.
+        :return: list of (r0, r1, c0, c1), end-exclusive, in order of first row and then first column
+        """
+        if self._bits is None:
+            self.sweep()
+        ncols = self._ncols
+        parent = []
+        boxes = []
+
+        def _find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        prev = []  # runs of the row above: (start, end, component)
+        for r in range(self._nrows):
+            st = r * ncols
+            cur = []
+            j = 0
+            for m in _RUN.finditer(self._bits, st, st + ncols):
+                c0, c1 = m.start() - st, m.end() - st
+                # runs above that touch this one, diagonals included: start <= c1 and end >= c0
+                while j < len(prev) and prev[j][1] < c0:
+                    j += 1
+                k = j
+                comp = None
+                while k < len(prev) and prev[k][0] <= c1:
+                    other = _find(prev[k][2])
+                    if comp is None:
+                        comp = other
+                    elif other != comp:
+                        parent[other] = comp
+                        a, b = boxes[comp], boxes[other]
+                        boxes[comp] = [min(a[0], b[0]), max(a[1], b[1]), min(a[2], b[2]), max(a[3], b[3])]
+                    k += 1
+                if comp is None:
+                    comp = len(parent)
+                    parent.append(comp)
+                    boxes.append([r, r + 1, c0, c1])
+                else:
+                    box = boxes[comp]
+                    box[1] = r + 1
+                    box[2] = min(box[2], c0)
+                    box[3] = max(box[3], c1)
+                cur.append((c0, c1, comp))
+                # the last run above may touch the next run in this row, too
+                j = max(j, k - 1)
+            prev = cur
+        return sorted((tuple(boxes[i]) for i in range(len(parent)) if parent[i] == i),
+                      key=lambda b: (b[0], b[2]))
+
+    def next_empty_in_col(self, col, start):
+        """
+        :param col:
+        :param start:
+        :return: row index of the first empty cell in the column at or after start, or -1
+        """
+        return self.col(col).find(0, start)
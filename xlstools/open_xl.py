@@ -1,24 +1,87 @@
+import io
+import os
 import xlrd
 from .openpyxlrd import OpenpyXlrdWorkbook
+from .native_xlsx import NativeXlsxWorkbook
 from .csv_reader import CsvWorkbook
+from .parse_cache import ParseCache, CachedWorkbook
+from .compressed import compression, decompressed_name, read_decompressed
+from .sources import is_path, sniff, as_buffer
 
 
-def open_xl(path, formatting_info=False, data_only=True, **kwargs):
+def open_xl(path, formatting_info=False, data_only=True, read_only=False, engine=None, materialize=False, cache=None,
+            **kwargs):
     """
     Reads XLS, XLSX, or CSV files into an object with a consistent, minimal read-only interface based on xlrd
-    :param path:
-    :param formatting_info:
+
+    XLS files are opened on demand, with the file memory-mapped: a sheet is decoded when it is first asked for, and
+    can be unloaded again (see XlReader.unload).  Call the book's release_resources() (or XlReader.close()) to close
+    the file.
+    :param path: may also be compressed: .gz, .bz2, .xz (e.g. data.csv.gz), or a .zip archive holding one spreadsheet.
+     It is decompressed in memory.  Or the file's contents: bytes, bytearray, memoryview, or a binary file object,
+     whose format is told by its first bytes (see sources.py).
+    :param formatting_info: [False] XLS only, passed to xlrd: also read cell formatting.  Formatted empty cells are
+     then read as XL_CELL_BLANK rather than XL_CELL_EMPTY.
     :param data_only:
+    :param read_only: [False] XLSX only: stream sheets from the file instead of loading the whole workbook. Much
+     lighter on large files, but random access to rows and columns becomes slow.
+    :param engine: XLSX: None or 'openpyxl' to read through openpyxl; 'native' to parse the sheet XML directly
+     (much faster; cached values only, so data_only and read_only are ignored).  CSV: None or 'pandas' to read with
+     pandas (if installed); 'native' to stream the file with the standard library (see CsvWorkbook, which also takes
+     parallel=True to parse a CSV in a pool of worker processes)
+    :param materialize: [False] openpyxl engine only: decode each sheet once into a columnar grid on first access, so
+     that row, column and cell lookups become index operations.  Costs memory; free it with the sheet's release().
+    :param cache: [None] paths only: a ParseCache, or a directory for one.  Sheets are served from the cache when the
+     file is unchanged since it was cached; otherwise the file is opened as usual and each sheet is cached as it is
+     first read.  Cached sheets are GridSheets over memory-mapped columns, whatever the engine.
     :param kwargs:
     :return:
     """
-    if path.lower().endswith('xls'):
-        return xlrd.open_workbook(path, formatting_info=formatting_info)
-    elif path.lower().endswith('csv'):
-        return CsvWorkbook(path, **kwargs)
+    if not is_path(path):
+        if cache is not None:
+            raise ValueError('cache requires a path')
+        kind, source, name = sniff(path)
+        return _open_source(kind, source, name, formatting_info=formatting_info, data_only=data_only,
+                            read_only=read_only, engine=engine, materialize=materialize, **kwargs)
+    path = os.fspath(path)
+    if cache is not None:
+        if not isinstance(cache, ParseCache):
+            cache = ParseCache(cache)
+        return CachedWorkbook(path, cache, lambda: open_xl(path, formatting_info=formatting_info, data_only=data_only,
+                                                           read_only=read_only, engine=engine,
+                                                           materialize=materialize, **kwargs),
+                              formatting_info=formatting_info, data_only=data_only, engine=engine,
+                              **{k: v for k, v in kwargs.items() if k not in ('parallel', 'max_workers')})
+    name = decompressed_name(path).lower()
+    kind = 'csv' if name.endswith('csv') else 'xls' if name.endswith('xls') else 'xlsx'
+    source = path
+    if kind != 'csv' and compression(path) is not None:
+        source = io.BytesIO(read_decompressed(path))
+    return _open_source(kind, source, None, formatting_info=formatting_info, data_only=data_only,
+                        read_only=read_only, engine=engine, materialize=materialize, **kwargs)
+
+
+def _open_source(kind, source, name, formatting_info=False, data_only=True, read_only=False, engine=None,
+                 materialize=False, **kwargs):
+    """
+    :param kind: 'csv', 'xls' or 'xlsx'
+    :param source: a path, or the file's contents (see sources.sniff)
+    :param name: the contents' file name, or None
+    """
+    if kind == 'csv':
+        return CsvWorkbook(source, engine=engine, name=name, **kwargs)
+    if kind == 'xls':
+        if is_path(source):
+            return xlrd.open_workbook(source, formatting_info=formatting_info, on_demand=True, use_mmap=True)
+        return xlrd.open_workbook(file_contents=as_buffer(source), formatting_info=formatting_info, on_demand=True)
     else:
         '''
         try:
         except:
         '''
-        return OpenpyXlrdWorkbook.from_file(path, data_only=data_only, **kwargs)
+        if engine == 'native':
+            return NativeXlsxWorkbook.from_file(source, **kwargs)
+        elif engine not in (None, 'openpyxl'):
+            raise ValueError('Unknown engine %s' % engine)
+        return OpenpyXlrdWorkbook.from_file(source, materialize=materialize, data_only=data_only, read_only=read_only,
+                                            **kwargs)
@@ -1,5 +1,8 @@
+from itertools import repeat, islice
+
 import openpyxl
-from .xlrd_like import XlrdSheetLike, XlrdCellLike, XlrdWorkbookLike
+from .xlrd_like import XlrdSheetLike, XlrdCellLike, XlrdWorkbookLike, EMPTY_CELL, value_ctype, value_columns
+from .value_grid import ValueGrid
 
 
 class OpenpyxlSheetLike(XlrdSheetLike):
@@ -12,22 +15,55 @@ class OpenpyxlSheetLike(XlrdSheetLike):
         """
         return self._xlsx
 
-    def __init__(self, xlsx_sheet):
+    def __init__(self, xlsx_sheet, materialize=False):
         """
         We have to access the openpyxl sheet's internal dict of _cells in order to filter out Nones when computing
         the spreadsheet's range
         :param xlsx_sheet:
+        :param materialize: [False] on first access, decode the sheet once into a ValueGrid and serve row(), col()
+         and cell() from it.  Use release() to drop the grid.
         """
         self._xlsx = xlsx_sheet
+        self._materialize = bool(materialize)
+        self._grid = None
         max_row = max_col = 0
         for coord, cell in xlsx_sheet._cells.items():  # we have to do this because openpyxl is.. designed for purposes different from mine
-            if cell.data_type == 'n':
+            if cell.value is None:
                 continue
             max_row = max([max_row, coord[0]])
             max_col = max([max_col, coord[1]])
         self._nrows = max_row
         self._ncols = max_col
 
+    def materialize(self):
+        """
+        Decode the sheet into a ValueGrid now (if not already done), and use it for all subsequent access
+        :return: the ValueGrid
+        """
+        self._materialize = True
+        if self._grid is None:
+            self._grid = ValueGrid.from_rows(self._xlsx.iter_rows(min_row=1, max_row=self._nrows, max_col=self._ncols,
+                                                                  values_only=True), self._ncols)
+        return self._grid
+
+    def release(self):
+        """
+        Free the materialized grid, and go back to reading from the openpyxl sheet
+        :return:
+        """
+        self._materialize = False
+        self._grid = None
+
+    @property
+    def grid(self):
+        """
+        The ValueGrid backing this sheet, or None if the sheet is not materialized
+        :return:
+        """
+        if self._materialize:
+            return self.materialize()
+        return None
+
     @property
     def name(self):
         return self._xlsx.title
@@ -50,10 +86,18 @@ class OpenpyxlSheetLike(XlrdSheetLike):
         if row > self._nrows:
             raise IndexError
 
+        grid = self.grid
+        if grid is not None:
+            return list(map(XlrdCellLike, grid.row_values(row - 1), grid.row_ctypes(row - 1)))
         rows = list(self._xlsx.iter_rows(min_row=row, max_row=row, max_col=self._ncols))  # 2nd order list)
         return [XlrdCellLike(k.value) for k in rows[0]]
 
     def get_rows(self):
+        grid = self.grid
+        if grid is not None:
+            for i in range(self._nrows):
+                yield list(map(XlrdCellLike, grid.row_values(i), grid.row_ctypes(i)))
+            return
         rows = list(self._xlsx.iter_rows(min_row=1, max_row=self._nrows, max_col=self._ncols))
         for row in rows:
             yield [XlrdCellLike(k.value) for k in row]
@@ -72,24 +116,231 @@ class OpenpyxlSheetLike(XlrdSheetLike):
         if col > self._ncols:
             raise IndexError
 
+        grid = self.grid
+        if grid is not None:
+            return list(map(XlrdCellLike, grid.col_values(col - 1), grid.col_ctypes(col - 1)))
         cols = list(self._xlsx.iter_cols(min_col=col, max_col=col, max_row=self._nrows))
         return [XlrdCellLike(k.value) for k in cols[0]]
 
+    def read_block(self, r0, r1, c0, c1):
+        r0, r1, c0, c1 = self._clamp_block(r0, r1, c0, c1)
+        if r1 <= r0:
+            return []
+        if c1 <= c0:
+            return [[] for _ in range(r0, r1)]
+        grid = self.grid
+        if grid is not None:
+            values = zip(*(grid.col_values(j)[r0:r1] for j in range(c0, c1)))
+            ctypes = zip(*(grid.col_ctypes(j)[r0:r1] for j in range(c0, c1)))
+            return [list(map(XlrdCellLike, v, t)) for v, t in zip(values, ctypes)]
+        # straight from the cell dict, like __init__: skips openpyxl's per-cell bookkeeping (and its habit of
+        # creating every empty cell it is asked about)
+        get = self._xlsx._cells.get
+        cols = range(c0 + 1, c1 + 1)
+        block = []
+        for r in range(r0 + 1, r1 + 1):
+            block.append([EMPTY_CELL if k is None else XlrdCellLike(k.value) for k in map(get, zip(repeat(r), cols))])
+        return block
+
+    def read_columns(self, r0, r1, c0, c1):
+        r0, r1, c0, c1 = self._clamp_block(r0, r1, c0, c1)
+        r1 = max(r0, r1)
+        grid = self.grid
+        if grid is not None:
+            return ([grid.col_values(j)[r0:r1] for j in range(c0, c1)],
+                    [bytes(grid.col_ctypes(j)[r0:r1]) for j in range(c0, c1)])
+        get = self._xlsx._cells.get
+        rows = range(r0 + 1, r1 + 1)
+        values = []
+        for c in range(c0 + 1, c1 + 1):
+            values.append([None if k is None else k.value for k in map(get, zip(rows, repeat(c)))])
+        return values, [bytes(map(value_ctype, k)) for k in values]
+
     def cell(self, row, col):
         row += 1
         col += 1
         if row > self._nrows or col > self._ncols:
             raise IndexError
 
+        grid = self.grid
+        if grid is not None:
+            return XlrdCellLike(grid.value(row - 1, col - 1), grid.ctype(row - 1, col - 1))
         cell = self._xlsx.cell(row, col)
         return XlrdCellLike(cell.value)
 
 
+class OpenpyxlReadOnlySheetLike(XlrdSheetLike):
+    """
+    Streaming counterpart to OpenpyxlSheetLike, for workbooks opened with openpyxl's read_only=True.
+
+    A read-only worksheet cannot be indexed randomly: every access re-parses the sheet XML from the top. So nothing
+    is read at construction; the sheet extents are found with a single pass on first use, and get_rows() streams one
+    row at a time without ever holding the whole sheet.  row(), col() and cell() work, but each costs a pass.
+    """
+    random_access = False
+
+    @property
+    def xlsx(self):
+        return self._xlsx
+
+    def __init__(self, xlsx_sheet):
+        self._xlsx = xlsx_sheet
+        self._nrows = None
+        self._ncols = None
+
+    def _measure(self):
+        """
+        The <dimension> tag of a read-only sheet is not to be trusted (it may be absent, count styled blanks, or be
+        too small), so we stream the values once and record the last non-None row and column.  openpyxl bounds an
+        unbounded iter_rows() by that same tag, so it is reset first.
+        :return:
+        """
+        self._xlsx.reset_dimensions()
+        max_row = max_col = 0
+        for i, row in enumerate(self._xlsx.iter_rows(values_only=True), start=1):
+            for j in range(len(row), max_col, -1):
+                if row[j - 1] is not None:
+                    max_col = j
+                    break
+            else:
+                if not any(k is not None for k in row[:max_col]):
+                    continue
+            max_row = i
+        self._nrows = max_row
+        self._ncols = max_col
+
+    @property
+    def name(self):
+        return self._xlsx.title
+
+    @property
+    def ncols(self):
+        if self._ncols is None:
+            self._measure()
+        return self._ncols
+
+    @property
+    def nrows(self):
+        if self._nrows is None:
+            self._measure()
+        return self._nrows
+
+    def _pad(self, values, n=None):
+        """
+        rows in the source may be short or missing; present them as exactly n (default ncols) wide
+        :param values:
+        :param n:
+        :return:
+        """
+        if n is None:
+            n = self.ncols
+        cells = [XlrdCellLike(k) for k in values[:n]]
+        if len(cells) < n:
+            cells.extend([EMPTY_CELL] * (n - len(cells)))
+        return cells
+
+    def _iter_values(self, min_row, max_row, min_col=1, max_col=None):
+        """
+        1-indexed, inclusive, like openpyxl
+        """
+        if max_col is None:
+            max_col = self.ncols
+        if max_row < min_row or max_col < min_col:
+            return
+        yield from self._xlsx.iter_rows(min_row=min_row, max_row=max_row, min_col=min_col, max_col=max_col,
+                                        values_only=True)
+
+    def row(self, row):
+        """
+        zero-indexed!
+        :param row:
+        :return:
+        """
+        row += 1
+        if row > self.nrows:
+            raise IndexError
+        for values in self._iter_values(row, row):
+            return self._pad(values)
+        return self._pad(())
+
+    def get_rows(self):
+        for values in self._iter_values(1, self.nrows):
+            yield self._pad(values)
+
+    def col(self, col):
+        """
+        Zero-indexed!
+        AND, per xlrd, negative index is counting from ncols
+        :param col:
+        :return:
+        """
+        if col < 0:
+            col = self.ncols + col + 1
+        else:
+            col += 1
+        if col > self.ncols:
+            raise IndexError
+        cells = [XlrdCellLike(values[0] if values else None)
+                 for values in self._iter_values(1, self.nrows, min_col=col, max_col=col)]
+        cells.extend(XlrdCellLike(None) for _ in range(len(cells), self.nrows))
+        return cells
+
+    def cell(self, row, col):
+        row += 1
+        col += 1
+        if row > self.nrows or col > self.ncols:
+            raise IndexError
+        for values in self._iter_values(row, row, min_col=col, max_col=col):
+            return XlrdCellLike(values[0] if values else None)
+        return XlrdCellLike(None)
+
+    def read_block(self, r0, r1, c0, c1):
+        """
+        One pass through the sheet, however many rows
+        """
+        r0, r1, c0, c1 = self._clamp_block(r0, r1, c0, c1)
+        if r1 <= r0:
+            return []
+        width = max(c1 - c0, 0)
+        block = [self._pad(values, width) for values in self._iter_values(r0 + 1, r1, min_col=c0 + 1, max_col=c1)]
+        block.extend([EMPTY_CELL] * width for _ in range(len(block), r1 - r0))
+        return block
+
+    def read_columns(self, r0, r1, c0, c1):
+        """
+        One pass, and no cells
+        """
+        r0, r1, c0, c1 = self._clamp_block(r0, r1, c0, c1)
+        for batch in self.iter_columns(r0, r1, c0, c1, max(r1 - r0, 1)):
+            return batch
+        return value_columns([], max(c1 - c0, 0))
+
+    def iter_columns(self, r0, r1, c0, c1, batch_rows):
+        """
+        One pass, and no cells
+        """
+        r0, r1, c0, c1 = self._clamp_block(r0, r1, c0, c1)
+        width = max(c1 - c0, 0)
+        pad = (None,) * width
+        rows = self._iter_values(r0 + 1, r1, min_col=c0 + 1, max_col=c1)
+        for r in range(r0, r1, batch_rows):
+            n = min(r + batch_rows, r1) - r
+            batch = [k + pad[len(k):] for k in islice(rows, n)]
+            batch.extend(pad for _ in range(len(batch), n))
+            yield value_columns(batch, width)
+
+
 class OpenpyXlrdWorkbook(XlrdWorkbookLike):
 
     @classmethod
-    def from_file(cls, file, **kwargs):
-        return cls(openpyxl.load_workbook(file, **kwargs))
+    def from_file(cls, file, materialize=False, **kwargs):
+        """
+        :param file:
+        :param materialize: see __init__
+        :param kwargs: passed to openpyxl.load_workbook. With read_only=True, sheets are streamed rather than loaded
+        :return:
+        """
+        return cls(openpyxl.load_workbook(file, **kwargs), materialize=materialize)
 
     @property
     def book(self):
@@ -99,25 +350,42 @@ class OpenpyXlrdWorkbook(XlrdWorkbookLike):
         """
         return self._book
 
-    def __init__(self, xl_book):
+    def __init__(self, xl_book, materialize=False):
         """
+        Sheets are wrapped on first access, since wrapping a sheet scans its cells
         :param xl_book: an initialized Openpyxl Workbook
+        :param materialize: [False] decode each sheet into a ValueGrid on first access (ignored for read-only books)
         """
         self._book = xl_book
+        self._materialize = materialize
         self._names = {k: i for i, k in enumerate(self._book.sheetnames)}
-        self._sheets = [OpenpyxlSheetLike(self._book[k]) for k in self._book.sheetnames]
+        self._sheets = [None] * len(self._names)
+
+    def _sheet(self, index):
+        sheet = self._sheets[index]
+        if sheet is None:
+            xlsx_sheet = self._book[self._book.sheetnames[index]]
+            if self._book.read_only:
+                sheet = OpenpyxlReadOnlySheetLike(xlsx_sheet)
+            else:
+                sheet = OpenpyxlSheetLike(xlsx_sheet, materialize=self._materialize)
+            self._sheets[index] = sheet
+        return sheet
 
     def sheet_names(self):
         return self._book.sheetnames
 
     def sheet_by_name(self, name):
-        return self._sheets[self._names[name]]
+        return self._sheet(self._names[name])
 
     def sheet_by_index(self, index):
-        return self._sheets[index]
+        return self._sheet(index)
 
     def sheets(self):
-        return self._sheets
+        return [self._sheet(i) for i in range(len(self._sheets))]
+
+    def unload_sheet(self, sheet_name_or_index):
+        self._sheets[self._sheet_index(sheet_name_or_index)] = None
 
     @property
     def filename(self):
@@ -0,0 +1,333 @@
+"""
+A persistent, on-disk cache of decoded sheets, shared by every process that points at the same directory.
+
+A file is identified by its absolute path, size, modification time and a hash of its first and last 64 KiB, plus the
+open_xl options that change what is read (formatting_info, data_only, CSV reader options).  If any of these change,
+the old entries are simply never hit again, and age out.
+
+Each sheet is cached in a file of its own, as soon as it is first read:
+    magic | header length | JSON header | ctypes of column 0 | ctypes of column 1 | ... | values of column 0 | ...
+The ctypes are raw bytes (one per cell); the values of each column are a pickled list.  On a hit the file is
+memory-mapped, and a column's values are unpickled only when something asks for them.  Sheet discovery mostly looks
+at ctypes, so a warm reopen costs little more than reading the JSON header.
+
+The directory is kept under max_bytes by evicting the least recently used files (a hit refreshes a file's mtime).
+
+Cache files contain pickles: point the cache only at a directory you trust.
+"""
+import hashlib
+import json
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+import weakref
+
+from .xlrd_like import XlrdWorkbookLike, read_columns, unload_sheet
+from .value_grid import GridSheet
+
+
+_MAGIC = b'XLSTOOLS-SHEET-1\n'
+_LEN = struct.Struct('<Q')
+_SAMPLE = 65536
+
+
+class MappedGrid(object):
+    """
+    The ValueGrid interface over a memory-mapped cache file.  Each column's values are unpickled on first use.
+    """
+    def __init__(self, mm, nrows, columns):
+        """
+        :param mm: the mapped file
+        :param nrows:
+        :param columns: list of (ctypes offset, values offset, values length)
+        """
+        self._mm = mm
+        self._view = memoryview(mm)
+        self._nrows = nrows
+        self._columns = columns
+        self._values = [None] * len(columns)
+
+    @property
+    def nrows(self):
+        return self._nrows
+
+    @property
+    def ncols(self):
+        return len(self._columns)
+
+    def col_ctypes(self, col):
+        st = self._columns[col][0]
+        return self._view[st:st + self._nrows]
+
+    def col_values(self, col):
+        values = self._values[col]
+        if values is None:
+            _, st, n = self._columns[col]
+            values = self._values[col] = pickle.loads(self._view[st:st + n])
+        return values
+
+    def close(self):
+        """
+        Unmap the file.  Values already unpickled remain; if ctypes views are still held elsewhere, the mapping is
+        closed when the last of them is dropped instead.
+        """
+        self._view.release()
+        try:
+            self._mm.close()
+        except BufferError:
+            pass
+
+    def value(self, row, col):
+        return self.col_values(col)[row]
+
+    def ctype(self, row, col):
+        return self.col_ctypes(col)[row]
+
+    def row_values(self, row):
+        return [self.col_values(j)[row] for j in range(self.ncols)]
+
+    def row_ctypes(self, row):
+        return [self.col_ctypes(j)[row] for j in range(self.ncols)]
+
+
+def _canonical(value):
+    """
+    An option value in a form whose repr does not depend on hash order (PYTHONHASHSEED), so that every process makes
+    the same key: sets become sorted tuples, and dicts sorted tuples of items, at any depth
+    """
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(map(_canonical, value), key=repr))
+    if isinstance(value, dict):
+        return tuple(sorted(((_canonical(k), _canonical(v)) for k, v in value.items()), key=repr))
+    if isinstance(value, (list, tuple)):
+        return type(value)(map(_canonical, value))
+    return value
+
+
+class ParseCache(object):
+    def __init__(self, directory, max_bytes=2 ** 30):
+        """
+        :param directory: created if it does not exist
+        :param max_bytes: [1 GiB] evict least recently used files to keep the directory under this size
+        """
+        self._dir = os.path.abspath(directory)
+        self._max_bytes = max_bytes
+        os.makedirs(self._dir, exist_ok=True)
+
+    @property
+    def directory(self):
+        return self._dir
+
+    def key(self, path, **options):
+        """
+        Identity of a file's contents, as read with the given options
+        :param path:
+        :param options: open_xl options that affect the values read
+        :return: hex digest
+        """
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        h = hashlib.blake2b(digest_size=20)
+        options = sorted((k, _canonical(v)) for k, v in options.items())
+        h.update(repr((path, st.st_size, st.st_mtime_ns, options)).encode())
+        with open(path, 'rb') as fp:
+            h.update(fp.read(_SAMPLE))
+            if st.st_size > _SAMPLE:
+                fp.seek(max(st.st_size - _SAMPLE, _SAMPLE))
+                h.update(fp.read(_SAMPLE))
+        return h.hexdigest()
+
+    def _path(self, key, suffix):
+        return os.path.join(self._dir, key + suffix)
+
+    @staticmethod
+    def _touch(path):
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def _write(self, path, chunks):
+        """
+        Write atomically: to a temporary file in the cache directory, then renamed into place
+        """
+        fd, tmp = tempfile.mkstemp(dir=self._dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as fp:
+                for chunk in chunks:
+                    fp.write(chunk)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        self.evict()
+
+    def load_names(self, key):
+        path = self._path(key, '.json')
+        try:
+            with open(path) as fp:
+                names = json.load(fp)
+        except (OSError, ValueError):
+            return None
+        self._touch(path)
+        return names
+
+    def store_names(self, key, names):
+        self._write(self._path(key, '.json'), [json.dumps(list(names)).encode()])
+
+    def load_sheet(self, key, index):
+        """
+        :param key:
+        :param index:
+        :return: a GridSheet over the mapped file, or None if the sheet is not cached
+        """
+        path = self._path(key, '.%d.sheet' % index)
+        try:
+            with open(path, 'rb') as fp:
+                mm = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        if mm[:len(_MAGIC)] != _MAGIC:
+            return None
+        st = len(_MAGIC)
+        n, = _LEN.unpack_from(mm, st)
+        st += _LEN.size
+        header = json.loads(mm[st:st + n])
+        st += n
+        columns = [(ct + st, vt + st, vn) for ct, vt, vn in header['columns']]
+        self._touch(path)
+        return GridSheet(header['name'], MappedGrid(mm, header['nrows'], columns))
+
+    def store_sheet(self, key, index, name, values, ctypes):
+        """
+        :param key:
+        :param index:
+        :param name:
+        :param values: list of value lists, as read_columns returns them
+        :param ctypes: list of ctype bytes
+        :return:
+        """
+        nrows = len(ctypes[0]) if ctypes else 0
+        pickles = [pickle.dumps(v, protocol=pickle.HIGHEST_PROTOCOL) for v in values]
+        # offsets are relative to the end of the header
+        columns = []
+        ct, vt = 0, nrows * len(ctypes)
+        for p in pickles:
+            columns.append((ct, vt, len(p)))
+            ct += nrows
+            vt += len(p)
+        header = json.dumps({'name': name, 'nrows': nrows, 'columns': columns}).encode()
+        self._write(self._path(key, '.%d.sheet' % index),
+                    [_MAGIC, _LEN.pack(len(header)), header] + [bytes(t) for t in ctypes] + pickles)
+
+    def evict(self):
+        """
+        Delete the least recently used cache files until the directory is under max_bytes
+        :return:
+        """
+        entries = []
+        total = 0
+        for e in os.scandir(self._dir):
+            if not e.name.endswith(('.sheet', '.json')):
+                continue
+            try:
+                st = e.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, e.path))
+            total += st.st_size
+        if total <= self._max_bytes:
+            return
+        for _, size, path in sorted(entries):
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+            if total <= self._max_bytes:
+                break
+
+
+class CachedWorkbook(XlrdWorkbookLike):
+    """
+    Serves sheets from a ParseCache, opening the file itself only for sheets (or sheet names) not yet cached.
+    """
+    def __init__(self, path, cache, opener, **options):
+        """
+        :param path:
+        :param cache: a ParseCache
+        :param opener: no-argument function that opens the file, for misses
+        :param options: open_xl options that affect the values read (part of the cache key)
+        """
+        self._path = path
+        self._cache = cache
+        self._opener = opener
+        self._book = None
+        self._key = cache.key(path, **options)
+        names = cache.load_names(self._key)
+        if names is None:
+            names = list(self._open().sheet_names())
+            cache.store_names(self._key, names)
+        self._names = names
+        self._sheets = [None] * len(names)
+        self._mapped = weakref.WeakSet()  # grids of cached sheets, to unmap on release_resources
+
+    def _open(self):
+        if self._book is None:
+            self._book = self._opener()
+        return self._book
+
+    def _sheet(self, index):
+        sheet = self._sheets[index]
+        if sheet is None:
+            sheet = self._cache.load_sheet(self._key, index)
+            if sheet is not None:
+                self._mapped.add(sheet.grid)
+            else:
+                src = self._open().sheet_by_index(index)
+                values, ctypes = read_columns(src, 0, src.nrows, 0, src.ncols)
+                self._cache.store_sheet(self._key, index, src.name, values, ctypes)
+                sheet = GridSheet.from_columns(src.name, values, ctypes)
+                unload_sheet(self._book, index)  # its values are held here now
+            self._sheets[index] = sheet
+        return sheet
+
+    @property
+    def filename(self):
+        return os.path.basename(self._path)
+
+    def sheet_names(self):
+        return list(self._names)
+
+    def sheet_by_name(self, name):
+        if name not in self._names:
+            self._open().sheet_by_name(name)  # for the error the file's own reader raises
+            raise KeyError(name)
+        return self._sheet(self._names.index(name))
+
+    def sheet_by_index(self, index):
+        return self._sheet(index)
+
+    def sheets(self):
+        return [self._sheet(i) for i in range(len(self._sheets))]
+
+    def unload_sheet(self, sheet_name_or_index):
+        self._sheets[self._sheet_index(sheet_name_or_index)] = None
+
+    def release_resources(self):
+        """
+        As xlrd's Book.release_resources: unmap the cached sheets, and release the file if it was opened.  Sheets
+        obtained before cannot be used afterwards; asking for them again reads them again.
+        :return:
+        """
+        for grid in list(self._mapped):
+            grid.close()
+        self._mapped.clear()
+        self._sheets = [None] * len(self._names)
+        if self._book is not None:
+            release = getattr(self._book, 'release_resources', None)
+            if release is not None:
+                release()
+            self._book = None
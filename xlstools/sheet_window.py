@@ -0,0 +1,85 @@
+"""
+A sheet cut off at a given number of rows and columns.
+
+Cells keep their coordinates in the underlying sheet, so an XlSheet over a window reports the same row numbers, and
+reads the same cells, as one over the whole sheet-- it just cannot see past the window's right and bottom edges.
+XlSheet.tables() uses windows to present each block of data on a sheet as a table of its own.
+"""
+from itertools import islice
+
+from .xlrd_like import XlrdSheetLike, EMPTY_CELL, read_block, read_columns, iter_columns
+
+
+class SheetWindow(XlrdSheetLike):
+    def __init__(self, sheet, nrows, ncols):
+        """
+        :param sheet: an XlrdSheetLike or xlrd sheet
+        :param nrows: rows 0 <= r < nrows are visible (clipped to the sheet)
+        :param ncols: columns 0 <= c < ncols are visible (clipped to the sheet)
+        """
+        self._s = sheet
+        self._nrows = min(nrows, sheet.nrows)
+        self._ncols = min(ncols, sheet.ncols)
+        self.random_access = getattr(sheet, 'random_access', True)
+
+    @property
+    def sheet(self):
+        return self._s
+
+    @property
+    def name(self):
+        return self._s.name
+
+    @property
+    def nrows(self):
+        return self._nrows
+
+    @property
+    def ncols(self):
+        return self._ncols
+
+    def _pad(self, cells, n):
+        cells = cells[:n]
+        if len(cells) < n:
+            cells = cells + [EMPTY_CELL] * (n - len(cells))
+        return cells
+
+    def row(self, row):
+        if row < 0:
+            row += self._nrows
+        if not 0 <= row < self._nrows:
+            raise IndexError(row)
+        return self._pad(list(self._s.row(row)), self._ncols)
+
+    def col(self, col):
+        """
+        negative index counts from ncols, per xlrd
+        :param col:
+        :return:
+        """
+        if col < 0:
+            col += self._ncols
+        if not 0 <= col < self._ncols:
+            raise IndexError(col)
+        return self._pad(list(self._s.col(col)), self._nrows)
+
+    def cell(self, row, col):
+        if row >= self._nrows or col >= self._ncols:
+            raise IndexError
+        return self._s.cell(row, col)
+
+    def get_rows(self):
+        for cells in islice(self._s.get_rows(), self._nrows):
+            yield self._pad(list(cells), self._ncols)
+
+    def read_block(self, r0, r1, c0, c1):
+        r0, r1, c0, c1 = self._clamp_block(r0, r1, c0, c1)
+        return read_block(self._s, r0, r1, c0, c1)
+
+    def read_columns(self, r0, r1, c0, c1):
+        r0, r1, c0, c1 = self._clamp_block(r0, r1, c0, c1)
+        return read_columns(self._s, r0, r1, c0, c1)
+
+    def iter_columns(self, r0, r1, c0, c1, batch_rows):
+        r0, r1, c0, c1 = self._clamp_block(r0, r1, c0, c1)
+        return iter_columns(self._s, r0, r1, c0, c1, batch_rows)
@@ -0,0 +1,180 @@
+"""
+Spreadsheets given as data rather than a path: bytes, bytearray, memoryview, mmap, or a binary file object (an upload,
+a socket file, an open file).
+
+The format is told from the first bytes: a ZIP archive is an XLSX (or, without [Content_Types].xml, an archive holding
+one spreadsheet); OLE2 is an XLS; gzip, bzip2 and xz data is decompressed and looked at again; anything else is taken
+as CSV text.
+
+Data is passed on without copying where the readers allow: XLSX engines and pandas read from a seekable file object
+(bytes are wrapped in a BytesIO, which shares them; other buffers in a ViewReader), while xlrd and the native CSV
+reader get a buffer (the object a memoryview is over, or a mapping of an open file).  A stream that cannot seek is
+read into memory once.
+"""
+import io
+import mmap
+import os
+import zipfile
+
+from .compressed import _OPENERS, _member, _read_all, decompressed_name
+
+
+OLE2_MAGIC = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+ZIP_MAGIC = (b'PK\x03\x04', b'PK\x05\x06')  # an archive, an empty archive
+GZIP_MAGIC = b'\x1f\x8b'
+XZ_MAGIC = b'\xfd7zXZ\x00'
+BZ2_MAGIC = b'BZh'
+BZ2_BLOCK_MAGIC = b'1AY&SY'  # follows 'BZh' and the block size digit: a CSV could begin with 'BZh', but not this
+
+HEAD_BYTES = 16
+
+DATA_NAME = 'Sheet1'  # name of a CSV sheet read from data with no file name
+
+
+def is_path(source):
+    return isinstance(source, (str, os.PathLike))
+
+
+def source_name(source):
+    """
+    The file name of a path or of a named file object, else None
+    :param source:
+    :return:
+    """
+    if is_path(source):
+        return os.fspath(source)
+    name = getattr(source, 'name', None)
+    return name if isinstance(name, str) else None
+
+
+def csv_name(source, name=None):
+    """
+    The file name of a CSV, to name its sheet by
+    :param source: path, or data
+    :param name: [None] for data: its file name, if not source_name(source)
+    :return: the file name without directories or compression suffix; None for data without a name
+    """
+    if is_path(source):
+        return os.path.basename(decompressed_name(os.fspath(source)))
+    name = name or source_name(source)
+    return None if name is None else os.path.basename(name)
+
+
+class ViewReader(io.RawIOBase):
+    """
+    A read-only, seekable file object over a buffer, without copying it (io.BytesIO copies anything but bytes)
+    """
+    def __init__(self, buffer):
+        self._view = memoryview(buffer).cast('B')
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, pos, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            pos += self._pos
+        elif whence == io.SEEK_END:
+            pos += len(self._view)
+        if pos < 0:
+            raise ValueError('negative seek position %d' % pos)
+        self._pos = pos
+        return pos
+
+    def readinto(self, b):
+        chunk = self._view[self._pos:self._pos + len(b)]
+        n = len(chunk)
+        memoryview(b).cast('B')[:n] = chunk
+        self._pos += n
+        return n
+
+
+def as_buffer(source):
+    """
+    The data as an object with the bytes methods the readers use (find, startswith, slicing): bytes, bytearray or mmap
+    :param source: bytes-like or binary file object
+    :return:
+    """
+    if isinstance(source, (bytes, bytearray, mmap.mmap)):
+        return source
+    if isinstance(source, memoryview):
+        if isinstance(source.obj, (bytes, bytearray, mmap.mmap)) and source.nbytes == len(source.obj) \
+                and source.contiguous:
+            return source.obj
+        return source.tobytes()  # a slice of something: the one copy
+    if isinstance(source, io.BytesIO):
+        return source.getvalue() if source.tell() == 0 else source.read()  # getvalue shares bytes it was made from
+    try:
+        if source.tell() == 0:
+            return mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+    except (AttributeError, OSError, ValueError):  # not a file on disk (or empty)
+        pass
+    return source.read()
+
+
+def as_file(source):
+    """
+    The data as a seekable binary file object, positioned at its start
+    :param source: bytes-like or binary file object
+    :return:
+    """
+    if isinstance(source, bytes):
+        return io.BytesIO(source)
+    if isinstance(source, (bytearray, memoryview, mmap.mmap)):
+        return ViewReader(source)
+    if source.seekable():
+        return source
+    return io.BytesIO(source.read())
+
+
+def _head(fp):
+    pos = fp.tell()
+    head = fp.read(HEAD_BYTES)
+    fp.seek(pos)
+    return head
+
+
+def sniff(source, name=None):
+    """
+    Find out what a spreadsheet given as data is
+    :param source: bytes-like or binary file object
+    :param name: [None] the data's file name, if not source_name(source)
+    :return: 'csv', 'xls' or 'xlsx'; the data, as given or as a seekable file object; its file name (for data from
+     a zip archive, the member's), or None
+    """
+    name = name or source_name(source)
+    fp = as_file(source)
+    start = fp.tell()
+    head = _head(fp)
+    if head.startswith(GZIP_MAGIC):
+        ext = '.gz'
+    elif head.startswith(XZ_MAGIC):
+        ext = '.xz'
+    elif head.startswith(BZ2_MAGIC) and head[4:10] == BZ2_BLOCK_MAGIC:
+        ext = '.bz2'
+    else:
+        ext = None
+    if ext is not None:
+        with _OPENERS[ext](fp, 'rb') as z:
+            data = _read_all(z)
+        if name and name.lower().endswith(ext):
+            name = name[:-len(ext)]
+        return sniff(data, name)
+    if head.startswith(ZIP_MAGIC):
+        with zipfile.ZipFile(fp) as archive:  # does not close fp
+            if '[Content_Types].xml' not in archive.namelist():
+                member = _member(archive)
+                return sniff(archive.read(member), member)
+        fp.seek(start)
+        return 'xlsx', fp, name
+    if not isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+        source = fp
+    if head.startswith(OLE2_MAGIC):
+        return 'xls', source, name
+    return 'csv', source, name
@@ -0,0 +1,146 @@
+"""
+Typed columns from cell values and ctypes.
+
+XlSheet reads its data region once, as one list of values and one bytes object of xlrd ctypes per column.  The ctypes
+present in a column decide its type, without examining the values cell by cell:
+ - numbers only: int64 if every value is an integer and none is missing; bool if every value is a boolean; else
+   float64, with NaN for empty cells
+ - booleans only (xlrd): bool
+ - dates only: datetime64, with NaT for empty cells (xlrd gives dates as numbers, which stay float64)
+ - text only: stripped strings, None for empty cells
+ - anything else, or missing values where the type has no NA: object, with values as clean_value gives them
+
+Arrow columns follow the same rules, except that every Arrow type takes nulls, so empty cells never force a column to
+a wider type; and a column with mixed types becomes strings, rendered as in XlSheet.gen_rows.
+
+Requires numpy (which comes with pandas); Arrow columns require pyarrow.
+"""
+from datetime import datetime
+
+import numpy as np
+
+from xlrd.biffh import (XL_CELL_EMPTY, XL_CELL_TEXT, XL_CELL_NUMBER, XL_CELL_DATE, XL_CELL_BOOLEAN, XL_CELL_BLANK,
+                        XL_CELL_ERROR)
+
+_MISSING = frozenset((XL_CELL_EMPTY, XL_CELL_BLANK))
+
+
+def _object_array(values):
+    arr = np.empty(len(values), dtype=object)
+    arr[:] = values
+    return arr
+
+
+def _number_kind(values):
+    """
+    'int', 'bool' or 'float' for a list of numeric values with no missing ones
+    """
+    types = set(map(type, values))
+    if all(issubclass(t, (bool, np.bool_)) for t in types):
+        return 'bool'
+    if all(issubclass(t, (int, np.integer)) and not issubclass(t, (bool, np.bool_)) for t in types):
+        return 'int'
+    return 'float'
+
+
+def numpy_column(values, ctypes):
+    """
+    :param values: list of cell values
+    :param ctypes: bytes of matching xlrd ctypes
+    :return: a 1-d numpy array
+    """
+    kinds = set(ctypes)
+    missing = bool(kinds & _MISSING)
+    kinds -= _MISSING
+    if missing:
+        values = [None if t in _MISSING else v for v, t in zip(values, ctypes)]
+
+    if not kinds:
+        return _object_array(values)
+
+    if len(kinds) == 1:
+        kind = kinds.pop()
+        if kind == XL_CELL_NUMBER:
+            if not missing:
+                number = _number_kind(values)
+                if number == 'bool':
+                    return np.array(values, dtype=bool)
+                if number == 'int':
+                    try:
+                        return np.array(values, dtype=np.int64)
+                    except OverflowError:
+                        pass
+            elif any(type(v) is bool for v in values):
+                return _object_array(values)
+            return np.array(values, dtype=np.float64)
+        if kind == XL_CELL_BOOLEAN and not missing:
+            return np.array(values, dtype=bool)
+        if kind == XL_CELL_DATE:
+            if all(isinstance(v, datetime) for v in values if v is not None):
+                return np.array(values, dtype='datetime64[us]')
+            return np.array(values, dtype=np.float64)
+        if kind == XL_CELL_TEXT:
+            return _object_array([v.strip() if isinstance(v, str) else v for v in values])
+
+    return _object_array([v.strip() if t == XL_CELL_TEXT and isinstance(v, str) else v
+                          for v, t in zip(values, ctypes)])
+
+
+def _arrow_string(value, ctype):
+    if value is None:
+        return None
+    if ctype == XL_CELL_TEXT and isinstance(value, str):
+        return value.strip()
+    if ctype == XL_CELL_ERROR:
+        return 'Error:%d' % value
+    return str(value)
+
+
+def arrow_column(values, ctypes, arrow_type=None):
+    """
+    :param values: list of cell values
+    :param ctypes: bytes of matching xlrd ctypes
+    :param arrow_type: [None] cast the result to this pyarrow type; ValueError if the values do not fit it
+    :return: a pyarrow Array
+    """
+    import pyarrow as pa
+
+    kinds = set(ctypes)
+    missing = bool(kinds & _MISSING)
+    kinds -= _MISSING
+    if missing:
+        values = [None if t in _MISSING else v for v, t in zip(values, ctypes)]
+
+    arr = None
+    if not kinds:
+        arr = pa.nulls(len(values))
+    elif len(kinds) == 1:
+        kind = next(iter(kinds))
+        if kind == XL_CELL_NUMBER:
+            number = _number_kind([v for v in values if v is not None] if missing else values)
+            if number == 'bool':
+                arr = pa.array(values, type=pa.bool_())
+            elif number == 'int':
+                try:
+                    arr = pa.array(values, type=pa.int64())
+                except (OverflowError, pa.ArrowInvalid):
+                    pass
+            if arr is None:
+                arr = pa.array(values, type=pa.float64())
+        elif kind == XL_CELL_BOOLEAN:
+            arr = pa.array([None if v is None else bool(v) for v in values], type=pa.bool_())
+        elif kind == XL_CELL_DATE:
+            if all(isinstance(v, datetime) for v in values if v is not None):
+                arr = pa.array(values, type=pa.timestamp('us'))
+            else:
+                arr = pa.array(values, type=pa.float64())
+    if arr is None:
+        arr = pa.array([_arrow_string(v, t) for v, t in zip(values, ctypes)], type=pa.string())
+
+    if arrow_type is not None and arr.type != arrow_type:
+        try:
+            arr = arr.cast(arrow_type)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as e:
+            raise ValueError('Column of %s cannot be stored as %s (%s); pass a schema, or a larger batch_rows' %
+                             (arr.type, arrow_type, e))
+    return arr
@@ -0,0 +1,148 @@
+"""
+A materialized, column-major copy of a sheet's values.
+
+A ValueGrid holds one list of native values per column, plus a parallel array of xlrd ctypes (one byte per cell)
+computed once when the grid is built.  Rows, columns and cells are then plain index operations, with no further
+trips to the backend that supplied the values.
+"""
+from array import array
+
+from .xlrd_like import value_ctype, XlrdSheetLike, XlrdCellLike
+
+
+class ValueGrid(object):
+    """
+    Values and ctypes of an nrows x ncols sheet region, stored by column
+    """
+    @classmethod
+    def from_rows(cls, rows, ncols):
+        """
+        Build a grid from an iterable of row value sequences.  Short rows are padded with None; long rows are
+        truncated to ncols.
+        :param rows: iterable of sequences of native values
+        :param ncols:
+        :return:
+        """
+        pad = (None,) * ncols
+        rows = [tuple(k[:ncols]) + pad[len(k):] if len(k) != ncols else k for k in rows]
+        if rows:
+            columns = [list(k) for k in zip(*rows)]
+        else:
+            columns = [[] for _ in range(ncols)]
+        return cls(columns)
+
+    def __init__(self, columns, ctypes=None):
+        """
+        :param columns: list of equal-length lists of native values
+        :param ctypes: optional list of array('B') of matching ctypes; computed if omitted
+        """
+        self._columns = columns
+        if ctypes is None:
+            ctypes = [array('B', map(value_ctype, k)) for k in columns]
+        self._ctypes = ctypes
+        self._nrows = len(columns[0]) if columns else 0
+
+    @property
+    def nrows(self):
+        return self._nrows
+
+    @property
+    def ncols(self):
+        return len(self._columns)
+
+    def value(self, row, col):
+        return self._columns[col][row]
+
+    def ctype(self, row, col):
+        return self._ctypes[col][row]
+
+    def row_values(self, row):
+        return [k[row] for k in self._columns]
+
+    def row_ctypes(self, row):
+        return [k[row] for k in self._ctypes]
+
+    def col_values(self, col):
+        return self._columns[col]
+
+    def col_ctypes(self, col):
+        return self._ctypes[col]
+
+
+class GridSheet(XlrdSheetLike):
+    """
+    A sheet whose only storage is a ValueGrid: e.g. one decoded elsewhere and shipped here as columns.
+    """
+    @classmethod
+    def from_columns(cls, name, values, ctypes):
+        """
+        :param name:
+        :param values: list of value lists, as read_columns returns them
+        :param ctypes: list of matching ctype bytes
+        :return:
+        """
+        return cls(name, ValueGrid(values, [array('B', k) for k in ctypes]))
+
+    def __init__(self, name, grid):
+        self._name = name
+        self._grid = grid
+
+    @property
+    def grid(self):
+        return self._grid
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def nrows(self):
+        return self._grid.nrows
+
+    @property
+    def ncols(self):
+        return self._grid.ncols
+
+    def row(self, row):
+        if row >= self.nrows:
+            raise IndexError
+        g = self._grid
+        return list(map(XlrdCellLike, g.row_values(row), g.row_ctypes(row)))
+
+    def get_rows(self):
+        for i in range(self.nrows):
+            yield self.row(i)
+
+    def col(self, col):
+        """
+        negative index counts from ncols, per xlrd
+        :param col:
+        :return:
+        """
+        if col < 0:
+            col += self.ncols
+        if not 0 <= col < self.ncols:
+            raise IndexError
+        return list(map(XlrdCellLike, self._grid.col_values(col), self._grid.col_ctypes(col)))
+
+    def cell(self, row, col):
+        if row >= self.nrows or col >= self.ncols:
+            raise IndexError
+        return XlrdCellLike(self._grid.value(row, col), self._grid.ctype(row, col))
+
+    def read_block(self, r0, r1, c0, c1):
+        r0, r1, c0, c1 = self._clamp_block(r0, r1, c0, c1)
+        if r1 <= r0:
+            return []
+        if c1 <= c0:
+            return [[] for _ in range(r0, r1)]
+        g = self._grid
+        values = zip(*(g.col_values(j)[r0:r1] for j in range(c0, c1)))
+        ctypes = zip(*(g.col_ctypes(j)[r0:r1] for j in range(c0, c1)))
+        return [list(map(XlrdCellLike, v, t)) for v, t in zip(values, ctypes)]
+
+    def read_columns(self, r0, r1, c0, c1):
+        r0, r1, c0, c1 = self._clamp_block(r0, r1, c0, c1)
+        r1 = max(r0, r1)
+        g = self._grid
+        return [g.col_values(j)[r0:r1] for j in range(c0, c1)], [bytes(g.col_ctypes(j)[r0:r1]) for j in range(c0, c1)]
@@ -17,58 +17,246 @@ For the moment, the
 
 
 import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 
 from .open_xl import open_xl
-from .xlrd_like import XlrdWorkbookLike
-from .xl_sheet import XlSheet
+from .xlrd_like import XlrdWorkbookLike, read_columns, unload_sheet
+from .xl_sheet import XlSheet, find_tables, _NameIndex
+from .value_grid import GridSheet
+from .sources import is_path, source_name
+
+
+CELL_BYTES = 64  # rough memory cost of one cell of a loaded sheet, for XlReader(max_bytes=...)
+
+
+def _load_sheet(path, index, open_args, sheet_args):
+    """
+    Worker for XlReader(parallel=True): open the file read-only (so that only this sheet is parsed), decode the sheet
+    into columns, and run discovery on them.  Everything returned is plain lists, bytes and scalars-- no workbook
+    objects-- so it is cheap to send back from another process.
+    :param path:
+    :param index:
+    :param open_args: passed to open_xl
+    :param sheet_args: passed to XlSheet
+    :return: name, values, ctypes, layout
+    """
+    sheet = open_xl(path, read_only=True, **open_args).sheet_by_index(index)
+    values, ctypes = read_columns(sheet, 0, sheet.nrows, 0, sheet.ncols)
+    xs = XlSheet(GridSheet.from_columns(sheet.name, values, ctypes), **sheet_args)
+    return sheet.name, values, ctypes, xs._layout()
 
 
 class XlReader(XlrdWorkbookLike):
     """
     How many times and in how many variants has this class been created?
     """
+    def _name_index(self):
+        """
+        The workbook's sheet names, with exact and prefix lookup.  They are read once, and again only when the
+        workbook's names_version changes (e.g. after create_sheet); loaded sheets then follow their names to their
+        new positions.
+        :return: a _NameIndex
+        """
+        version = getattr(self._xl, 'names_version', 0)
+        if self._names is None or version != self._names_seen:
+            names = list(self._xl.sheet_names())
+            if self._names is not None:
+                self._remap(names)
+            self._names = _NameIndex(names)
+            self._names_seen = version
+        return self._names
+
+    def _remap(self, names):
+        old = {k: i for i, k in enumerate(self._names.headers)}
+        moved = [old.get(k) for k in names]  # new index -> old index
+        new = {i: j for j, i in enumerate(moved) if i is not None}
+        self._sheets = [None if i is None else self._sheets[i] for i in moved]
+        self._evicted = {new[i]: v for i, v in self._evicted.items() if i in new}
+        self._lru = OrderedDict((new[i], v) for i, v in self._lru.items() if i in new)
+        self._lru_bytes = sum(self._lru.values())
+
     def _get_sheet_index(self, sheet):
+        names = self._name_index()
         if isinstance(sheet, int):
-            return sheet
+            return sheet + len(names.headers) if sheet < 0 else sheet
         try:
-            inx = self._xl.sheet_names().index(sheet)
-        except IndexError:
-            try:
-                inx = next(i for i, k in enumerate(self._xl.sheet_names()) if k.startswith(sheet))
-            except StopIteration:
-                raise KeyError('Sheet not found %s' % sheet)
-        return inx
+            return names.find(sheet)
+        except (KeyError, TypeError):
+            raise KeyError('Sheet not found %s' % sheet)
 
     def select_sheet(self, sheet):
         return self.__getitem__(sheet)
 
     def _check_xl_sheet(self, inx):
         if not isinstance(self._sheets[inx], XlSheet):
-            self._sheets[inx] = XlSheet(self._xl.sheet_by_index(inx), **self._args)
+            saved = self._evicted.pop(inx, None)
+            if self._parallel:
+                xs = self._from_payload(_load_sheet(self._fname, inx, self._open_args, self._args), saved)
+            elif saved is None:
+                xs = XlSheet(self._xl.sheet_by_index(inx), **self._args)
+            else:
+                xs = XlSheet._from_layout(self._xl.sheet_by_index(inx), *saved, **self._args)
+            self._sheets[inx] = xs
+        self._touch(inx)
         return self._sheets[inx]
 
+    def _from_payload(self, payload, saved=None):
+        name, values, ctypes, layout = payload
+        if saved is None:
+            saved = (layout,)
+        return XlSheet._from_layout(GridSheet.from_columns(name, values, ctypes), *saved, **self._args)
+
+    def _touch(self, inx):
+        """
+        Mark a loaded sheet as most recently used, and evict the least recently used ones while over budget
+        :param inx:
+        :return:
+        """
+        if self._max_sheets is None and self._max_bytes is None:
+            return
+        if inx in self._lru:
+            self._lru.move_to_end(inx)
+            return
+        xs = self._sheets[inx]
+        self._lru[inx] = xs.nrows * xs.ncols * CELL_BYTES
+        self._lru_bytes += self._lru[inx]
+        while len(self._lru) > 1 and self._over_budget():
+            self._evict(next(iter(self._lru)))
+
+    def _over_budget(self):
+        if self._max_sheets is not None and len(self._lru) > self._max_sheets:
+            return True
+        return self._max_bytes is not None and self._lru_bytes > self._max_bytes
+
+    def _evict(self, inx):
+        """
+        Drop a loaded sheet, and its backend sheet where the backend allows.  Its layout and options-- including any
+        changes made through the XlSheet-- are kept, so that it is rebuilt as it was, without discovery.
+        :param inx:
+        :return:
+        """
+        xs = self._sheets[inx]
+        self._evicted[inx] = (xs._layout(), list(xs._opts))
+        self._sheets[inx] = None
+        self._lru_bytes -= self._lru.pop(inx, 0)
+        unload_sheet(self._xl, inx)
+
+    def unload(self, sheet):
+        """
+        Drop a loaded sheet now, as if it were evicted (see max_sheets): the backend's copy is unloaded too, and the
+        sheet is rebuilt as it was on next access
+        :param sheet: name or index
+        :return:
+        """
+        inx = self._get_sheet_index(sheet)
+        if isinstance(self._sheets[inx], XlSheet):
+            self._evict(inx)
+
+    def close(self):
+        """
+        Drop every loaded sheet and release the workbook's file (e.g. an xlrd book's mapping).  No sheet can be
+        loaded afterwards.
+        :return:
+        """
+        for inx, xs in enumerate(self._sheets):
+            if xs is not None:
+                self._sheets[inx] = None
+                unload_sheet(self._xl, inx)
+        self._lru.clear()
+        self._lru_bytes = 0
+        self._evicted.clear()
+        release = getattr(self._xl, 'release_resources', None)
+        if release is not None:
+            release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _load_parallel(self):
+        """
+        Parse and discover every sheet not yet loaded, one per worker process
+        :return: dict of index -> XlSheet, of every sheet loaded before or by this call.  (With max_sheets or
+         max_bytes, the reader itself may have evicted some of them already.)
+        """
+        held = {i: k for i, k in enumerate(self._sheets) if isinstance(k, XlSheet)}
+        todo = [i for i in range(len(self._sheets)) if i not in held]
+        if len(todo) < 2:
+            return held
+        with ProcessPoolExecutor(max_workers=self._max_workers) as pool:
+            futures = [pool.submit(_load_sheet, self._fname, i, self._open_args, self._args) for i in todo]
+            for i, f in zip(todo, futures):
+                held[i] = self._sheets[i] = self._from_payload(f.result(), self._evicted.pop(i, None))
+                self._touch(i)
+        return held
+
     def __getitem__(self, item):
         inx = self._get_sheet_index(item)
         if inx is None:
             raise KeyError
         return self._check_xl_sheet(inx)
 
-    def __init__(self, xlfile, formatting_info=False, **kwargs):
+    def __init__(self, xlfile, formatting_info=False, read_only=False, engine=None, parallel=False, max_workers=None,
+                 cache=None, max_sheets=None, max_bytes=None, **kwargs):
         """
         Open an Xl file for tabular data access
-        :param xlfile: an XlrdWorkbookLike or a filename
+        :param xlfile: an XlrdWorkbookLike, a filename, or the file's contents: bytes-like or a binary file object (see
+         open_xl)
         :param formatting_info: whether to open the spreadsheet with formatting (not implemented upstream for XLSX)
+        :param read_only: [False] stream XLSX sheets rather than loading them (see open_xl)
+        :param engine: [None] XLSX reader engine: 'openpyxl' or 'native' (see open_xl)
+        :param parallel: [False] filenames only: sheets() parses and discovers the sheets in a pool of worker
+         processes.  Each worker opens the file read-only and sends back its sheet's values by column, so every sheet
+         ends up held in a ValueGrid (the XlSheet wraps a GridSheet rather than the engine's own sheet).  A CSV is
+         instead parsed by the native CSV engine in a pool of workers (see CsvWorkbook).
+        :param max_workers: [None] size of the process pool; default is the number of CPUs
+        :param cache: [None] filenames only: a ParseCache or a directory for one (see open_xl).  Parallel workers
+         share it too.
+        :param max_sheets: [None] keep at most this many XlSheets loaded, evicting the least recently used
+        :param max_bytes: [None] keep the loaded XlSheets under about this much memory (estimated at CELL_BYTES per
+         cell), evicting the least recently used.  An evicted sheet is rebuilt on next access, with the datarow,
+         datacol, headerrow and options it had when evicted.  (Changes made to an XlSheet after its eviction are not
+         seen by the rebuilt one.)  Eviction frees what the engine parsed for the sheet, except that a workbook
+         loaded whole by openpyxl (not read_only) keeps every sheet's cells regardless.
         :param kwargs: defaults to get passed to every XlSheet
         """
         self._args = kwargs
+        self._parallel = False
+        self._max_sheets = max_sheets
+        self._max_bytes = max_bytes
+        self._lru = OrderedDict()  # index of loaded XlSheet -> estimated bytes, least recently used first
+        self._lru_bytes = 0
+        self._evicted = dict()  # index -> (layout, opts) of evicted XlSheets
+        self._max_workers = max_workers
         if isinstance(xlfile, XlrdWorkbookLike):
             self._xl = xlfile
             self._fname = xlfile.filename
+        elif not is_path(xlfile):
+            # contents are parsed here: parallel workers need a file to open
+            self._xl = open_xl(xlfile, formatting_info=formatting_info, read_only=read_only, engine=engine,
+                               cache=cache)
+            self._fname = source_name(xlfile)
+        elif parallel and os.fspath(xlfile).lower().endswith('csv'):
+            # a single sheet: the CSV reader splits the file itself among worker processes
+            self._xl = open_xl(xlfile, engine=engine, cache=cache, parallel=True, max_workers=max_workers)
+            self._fname = os.path.abspath(xlfile)
+        elif parallel:
+            # the workers do the parsing: here we only need the sheet names
+            self._parallel = True
+            self._open_args = {'formatting_info': formatting_info, 'engine': engine, 'cache': cache}
+            self._xl = open_xl(xlfile, formatting_info=formatting_info, read_only=True, engine=engine, cache=cache)
+            self._fname = os.path.abspath(xlfile)
         else:
-            self._xl = open_xl(xlfile, formatting_info=formatting_info)
+            self._xl = open_xl(xlfile, formatting_info=formatting_info, read_only=read_only, engine=engine,
+                               cache=cache)
             self._fname = os.path.abspath(xlfile)
 
-        self._sheets = [None] * len(self._xl.sheet_names())
+        self._names = None
+        self._names_seen = None
+        self._sheets = [None] * len(self._name_index().headers)
 
     @property
     def filepath(self):
@@ -76,18 +264,32 @@ class XlReader(XlrdWorkbookLike):
 
     @property
     def filename(self):
-        return os.path.basename(self._fname)
+        return None if self._fname is None else os.path.basename(self._fname)
 
     def __len__(self):
-        return len(self._xl.sheets())
+        return len(self._name_index().headers)
 
     def gen_rows(self, sheet=None):
         sh = self.__getitem__(sheet)
         return sh.gen_rows()
 
+    def tables(self, sheet, min_rows=2, min_cols=1):
+        """
+        Every separate block of data on the sheet, as its own XlSheet (see XlSheet.tables).  The sheet's own
+        discovery is not run.
+        :param sheet: name or index
+        :param min_rows: [2]
+        :param min_cols: [1]
+        :return:
+        """
+        inx = self._get_sheet_index(sheet)
+        if isinstance(self._sheets[inx], XlSheet):
+            return self._sheets[inx].tables(min_rows=min_rows, min_cols=min_cols)
+        return find_tables(self._xl.sheet_by_index(inx), min_rows=min_rows, min_cols=min_cols)
+
     @property
     def sheet_names(self):
-        return self._xl.sheet_names()
+        return list(self._name_index().headers)
 
     def sheet_by_name(self, name):
         return self.__getitem__(name)
@@ -96,4 +298,12 @@ class XlReader(XlrdWorkbookLike):
         return self.__getitem__(index)
 
     def sheets(self):
-        return [self.__getitem__(k) for k in self.sheet_names]
+        """
+        Every sheet, as an XlSheet.  With max_sheets or max_bytes, the list holds them all, while the reader keeps
+        only its budget loaded.  (With parallel=True, the list is made of the sheets as the pool returned them, so
+        that those evicted on arrival are not parsed again.)
+        :return:
+        """
+        n = len(self)
+        held = self._load_parallel() if self._parallel else {}
+        return [held[i] if i in held else self._check_xl_sheet(i) for i in range(n)]
@@ -11,12 +11,21 @@ Uses the cheap, lightweight xlrd-like class as an access layer.
 """
 
 
-from .xlrd_like import XL_CELL_EMPTY, XL_CELL_TEXT, XL_CELL_NUMBER, XlrdSheetLike
-from xlrd.biffh import XL_CELL_ERROR
+from bisect import bisect_left
+from itertools import islice, compress
+
+from .xlrd_like import XL_CELL_EMPTY, XL_CELL_TEXT, XL_CELL_NUMBER, XlrdSheetLike, read_block, read_columns, iter_columns
+from .occupancy import Occupancy
+from .sheet_window import SheetWindow
+from xlrd.biffh import XL_CELL_ERROR, XL_CELL_BLANK
 
 N_OPTS = 4
 (MULTI, ROW_GAPS, COL_GAPS, MATRIX) = range(N_OPTS)
 
+CHUNK_ROWS = 256  # rows per read_block() call when scanning the data region
+
+_HAS_DATA = bytes(1 if k not in (XL_CELL_EMPTY, XL_CELL_ERROR) else 0 for k in range(256))  # as _parse_row's _empty
+
 def _mk_xl_opts():
     return [None] * N_OPTS
 
@@ -83,14 +92,111 @@ class _EmptyRow(Exception):
     pass
 
 
+def find_tables(sheet, occupancy=None, min_rows=2, min_cols=1):
+    """
+    Every separate block of data on a sheet, as a table: the block's first row holds the headers, and the rest is
+    data.  Blocks are the connected regions of non-empty cells (see Occupancy.blocks), so tables must be separated by
+    at least one empty row or column.
+    :param sheet: an XlrdSheetLike or xlrd sheet
+    :param occupancy: [None] the sheet's Occupancy, if one exists already
+    :param min_rows: [2] ignore blocks with fewer rows, headers included (e.g. stray titles and notes)
+    :param min_cols: [1] ignore blocks with fewer columns
+    :return: list of XlSheets, each over a SheetWindow that ends at the block's last row and column
+    """
+    if occupancy is None:
+        occupancy = Occupancy.from_sheet(sheet)
+    tables = []
+    for r0, r1, c0, c1 in occupancy.blocks():
+        if r1 - r0 < min_rows or c1 - c0 < min_cols:
+            continue
+        tables.append(XlSheet(SheetWindow(sheet, r1, c1), strict=True, datarow=r0 + 1, datacol=c0))
+    return tables
+
+
+def _as_list(columns):
+    """
+    aggregate() arguments may be a single column (name or position) or a list of them
+    """
+    if columns is None or columns is False:
+        return []
+    if isinstance(columns, (str, int)):
+        return [columns]
+    return list(columns)
+
+
+class _Group(object):
+    """
+    Running totals for one group in aggregate()
+    """
+    __slots__ = ('rows', 'counts', 'sums', 'mins', 'maxs')
+
+    def __init__(self, n_count, n_sum, n_min, n_max):
+        self.rows = 0
+        self.counts = [0] * n_count
+        self.sums = [0] * n_sum
+        self.mins = [None] * n_min
+        self.maxs = [None] * n_max
+
+
+class _NameIndex(object):
+    """
+    Exact and prefix lookup of names in a list-- column headers (as find_column) or sheet names (as XlReader): an
+    exact match wins; otherwise the first name (by position) that starts with the given one
+    """
+    def __init__(self, headers):
+        self.headers = headers
+        self._exact = dict()
+        for i, k in enumerate(headers):
+            self._exact.setdefault(k, i)
+        self._names = sorted((k, i) for i, k in enumerate(headers) if isinstance(k, str))
+        self._prefixes = dict()
+
+    def find(self, name):
+        """
+        :param name:
+        :return: position of the name in the list
+        """
+        try:
+            return self._exact[name]
+        except KeyError:
+            pass
+        try:
+            return self._prefixes[name]
+        except KeyError:
+            pass
+        # names that start with the prefix sort together, directly after it
+        names = self._names
+        j = bisect_left(names, (name,))
+        found = None
+        while j < len(names) and names[j][0].startswith(name):
+            if found is None or names[j][1] < found:
+                found = names[j][1]
+            j += 1
+        if found is None:
+            raise KeyError(name)
+        self._prefixes[name] = found
+        return found
+
+
 class XlSheet(XlrdSheetLike):
     """
     This class handles access to a single SHEET_NAME---
     Fully defined, the SHEET_NAME has a data row (default 1), data column (default 0), and a set of column headers
     """
+    @property
+    def occupancy(self):
+        """
+        Non-empty profile of the underlying sheet, created on first use.  Discovery and lastrow are answered from
+        it, so no row or column of the sheet is read more than once for them.
+        :return: an Occupancy
+        """
+        if self._occ is None:
+            self._occ = Occupancy.from_sheet(self._s)
+        return self._occ
+
     def _next_row_thresh(self, start=0, thresh=0.7):
         while start < self._s.nrows:
-            sh, first = share(self._s.row(start))
+            sh, first = self.occupancy.row_share(start)
             if sh > thresh:
                 return start, first
             start += 1
@@ -110,7 +216,7 @@ class XlSheet(XlrdSheetLike):
             start = apparent_start
 
         while start < self._s.ncols:
-            row, ck = _longest(self._s.col(start))
+            row, ck = self.occupancy.longest_run(start)
             if ck > use_thresh:
                 return start, row
             start += 1
@@ -181,11 +287,13 @@ class XlSheet(XlrdSheetLike):
         self.headerrow = hr
 
     def _setopt(self, opt, val):
-        self._opts[opt] = bool(val)
+        val = bool(val)
         # reset internal lastrow
         self._lr_int = None
-        # recompute headers
-        self._compute_headers()
+        if opt == MULTI and val != self._opts[opt]:
+            # headers are recomputed on next use
+            self._headers = None
+        self._opts[opt] = val
 
     def _getopt(self, opt):
         return self._opts[opt]
@@ -213,18 +321,20 @@ class XlSheet(XlrdSheetLike):
         :param multiheader:
         """
         self._s = sheet
+        self._occ = None
         self._r = None
         self._lr = None
         self._lr_int = None
         self._hr = None
         self._c = None
+        self._headers = None  # None until computed, and again whenever something they depend on changes
+        self._hindex = None
 
         # don't know what I'm doing with this
         self._opts = _mk_xl_opts()
         self._setopt(MULTI, multiheader)
         self._setopt(ROW_GAPS, row_gaps)
         self._setopt(COL_GAPS, col_gaps)
-        self._cached_headers = []
 
         if strict:
             self.datarow = datarow or 1
@@ -234,6 +344,41 @@ class XlSheet(XlrdSheetLike):
         else:
             self._discover(datarow, datacol)
 
+    def _layout(self):
+        """
+        The data region as discovered (or given), with lastrow and headers resolved, for rebuilding this XlSheet over
+        another copy of the sheet with _from_layout
+        :return: tuple of plain values
+        """
+        self.lastrow
+        return self._r, self._c, self._hr, self._lr, self._lr_int, self.headers
+
+    @classmethod
+    def _from_layout(cls, sheet, layout, opts=None, **kwargs):
+        """
+        An XlSheet over the sheet with the given layout, without running discovery
+        :param sheet:
+        :param layout: from _layout()
+        :param opts: [None] option values to restore (a copy of another XlSheet's _opts); default from kwargs
+        :param kwargs: XlSheet options; strict, datarow and datacol are ignored
+        :return:
+        """
+        xs = cls(sheet, **dict(kwargs, strict=True, datarow=None, datacol=None))
+        if opts is not None:
+            xs._opts = list(opts)
+        xs._r, xs._c, xs._hr, xs._lr, xs._lr_int, xs._headers = layout
+        return xs
+
+    def tables(self, min_rows=2, min_cols=1):
+        """
+        Every separate block of data on the sheet, as an XlSheet of its own with datarow, datacol and lastrow set.
+        Row and column numbers remain those of this sheet.  See find_tables.
+        :param min_rows: [2]
+        :param min_cols: [1]
+        :return: list of XlSheets, in order of first row and then first column
+        """
+        return find_tables(self._s, occupancy=self.occupancy, min_rows=min_rows, min_cols=min_cols)
+
     @property
     def is_null(self):
         return self._s.nrows == 0
@@ -256,7 +401,10 @@ class XlSheet(XlrdSheetLike):
 
     @datarow.setter
     def datarow(self, row):
-        self._r = int(row)
+        row = int(row)
+        if row != self._r:
+            self._r = row
+            self._headers = None
 
     @property
     def headerrow(self):
@@ -266,12 +414,20 @@ class XlSheet(XlrdSheetLike):
 
     @headerrow.setter
     def headerrow(self, row):
-        self._hr = int(row)
-        self._compute_headers()
+        row = int(row)
+        if row != self._hr:
+            self._hr = row
+            self._headers = None
 
     @property
     def headers(self):
-        return self._cached_headers
+        """
+        Computed on first use after datarow, datacol, headerrow or the MULTI option changes
+        :return:
+        """
+        if self._headers is None:
+            self._headers = self._compute_headers()
+        return self._headers
 
     @property
     def datacol(self):
@@ -279,9 +435,11 @@ class XlSheet(XlrdSheetLike):
 
     @datacol.setter
     def datacol(self, col):
-        self._c = int(col)
-        self._lr_int = None
-        self._compute_headers()
+        col = int(col)
+        if col != self._c:
+            self._c = col
+            self._lr_int = None
+            self._headers = None
 
     @property
     def lastrow(self):
@@ -290,15 +448,14 @@ class XlSheet(XlrdSheetLike):
         if self._lr_int is None:
             if self._getopt(ROW_GAPS):
                 # if ROW_GAPS is true, lastrow is the last row with a nonempty entry in the data column
-                self._lr_int = max(i for i, k in enumerate(self._s.col(self.datacol))
-                                   if k.ctype != XL_CELL_EMPTY) + 1
+                self._lr_int = self.occupancy.last_in_col(self.datacol) + 1
             else:
                 # if ROW_GAPS is false: lastrow is the last row before the first empty row after the first data row
-                try:
-                    self._lr_int = next(i for i, k in enumerate(self._s.col(self.datacol))
-                                        if i > self.datarow and k.ctype == XL_CELL_EMPTY)
-                except StopIteration:
+                nxt = self.occupancy.next_empty_in_col(self.datacol, self.datarow + 1)
+                if nxt < 0:
                     self._lr_int = self._s.nrows
+                else:
+                    self._lr_int = nxt
         return self._lr_int
 
     @lastrow.setter
@@ -332,33 +489,105 @@ class XlSheet(XlrdSheetLike):
 
     def _compute_headers(self, multi=None, start=None):
         """
-        Generate a list of headers from the current configuration (slow)
-        access the protected variable _headers to use the cached list (fast)
+        Generate a list of headers from the current configuration (slow), with one read_block() of the header rows
+        use the headers property to get the cached list (fast)
 
         :param multi:
         :param start: if multi is false, start is the header row. if multi is true, start is the start of the header
         :return:
         """
         if self.datacol is None:
-            return
+            return []
         multi = multi or self.multi
-        headers = []
-        for i in range(self.datacol, self._s.ncols):
-            headers.append(self._header(i, multi, start))
-        self._cached_headers = headers
+        ncols = self._s.ncols
+        if multi:
+            r0, r1 = start or 0, self.datarow
+        else:
+            r0 = start or self.headerrow
+            r1 = r0 + 1
+        if not 0 <= r0 < r1 <= self._s.nrows:
+            # header rows are not (all) in the sheet: leave them to the backend's cell(), as _header does
+            return [self._header(i, multi, start) for i in range(self.datacol, ncols)]
+        block = read_block(self._s, r0, r1, self.datacol, ncols)
+        if multi:
+            return [' '.join(str(k.value).strip() for k in cells).strip() for cells in zip(*block)]
+        return [clean_value(k) for k in block[0]]
+
+    @property
+    def header_index(self):
+        """
+        Lookup table for find_column, rebuilt whenever the headers are
+        :return:
+        """
+        headers = self.headers
+        if self._hindex is None or self._hindex.headers is not headers:
+            self._hindex = _NameIndex(headers)
+        return self._hindex
 
     def _read_row(self, rownum, _make_dict=None):
+        return self._parse_row(self._s.row(rownum)[self.datacol:], _make_dict=_make_dict)
+
+    def _gen_region(self, start, stop, c0, c1):
+        """
+        Generates the rows of the given region of the underlying sheet (as lists of cells c0 <= c < c1), read in
+        blocks of CHUNK_ROWS rows.  A sheet that can only be streamed is instead read front to back in one pass.
+        :param start:
+        :param stop:
+        :param c0:
+        :param c1:
+        :return:
+        """
+        if not getattr(self._s, 'random_access', True):
+            for cells in islice(self._s.get_rows(), start, stop):
+                yield cells[c0:c1]
+            return
+        for r in range(start, stop, CHUNK_ROWS):
+            yield from read_block(self._s, r, min(r + CHUNK_ROWS, stop), c0, c1)
+
+    def _gen_columns(self, start, stop, cols):
+        """
+        As _gen_region, but for a list of columns of the underlying sheet, in any order.  On random-access sheets
+        each run of adjacent columns is read as a block of its own, so cells between the listed columns are never read.
+        :param start:
+        :param stop:
+        :param cols:
+        :return:
+        """
+        if not getattr(self._s, 'random_access', True):
+            for cells in islice(self._s.get_rows(), start, stop):
+                yield [cells[k] for k in cols]
+            return
+        uniq = sorted(set(cols))
+        pick = [uniq.index(k) for k in cols]
+        runs = []
+        for k in uniq:
+            if runs and runs[-1][1] == k:
+                runs[-1][1] = k + 1
+            else:
+                runs.append([k, k + 1])
+        for r in range(start, stop, CHUNK_ROWS):
+            r1 = min(r + CHUNK_ROWS, stop)
+            blocks = [read_block(self._s, r, r1, c0, c1) for c0, c1 in runs]
+            for parts in zip(*blocks):
+                cells = [k for part in parts for k in part]
+                yield [cells[k] for k in pick]
+
+    def _parse_row(self, cells, _make_dict=None):
+        """
+        :param cells: the row's cells, beginning at datacol
+        :param _make_dict:
+        :return:
+        """
         _o = []
         _empty = True
-        for i, k in enumerate(self._s.row(rownum)):
-            if i < self.datacol:
-                continue
-            if k.ctype == XL_CELL_TEXT:
+        for k in cells:
+            ctype = k.ctype
+            if ctype == XL_CELL_TEXT:
                 _empty = False
                 _o.append(k.value.strip())
-            elif k.ctype == XL_CELL_ERROR:
+            elif ctype == XL_CELL_ERROR:
                 _o.append('Error:%d' % k.value)
-            elif k.ctype == XL_CELL_EMPTY:
+            elif ctype == XL_CELL_EMPTY:
                 _o.append(None)
             else:
                 _empty = False
@@ -375,26 +604,56 @@ class XlSheet(XlrdSheetLike):
         for i, row in self.gen_rows():
             yield row
 
-    def gen_rows(self, mask=None, rowdict=False):
+    def gen_rows(self, mask=None, rowdict=False, columns=None):
         """
         Blank cells have value None
         :param mask:
         :param rowdict:
+        :param columns: [None] only yield these columns (names or positions, as find_column), in this order.  With
+         ROW_GAPS, a row is then skipped when all of the selected cells are blank.
         :return: generates i, row tuples, but only for [non-blank] data rows
         """
-        if rowdict:
+        if columns is None:
+            cols = None
             h = self.headers
         else:
+            cols = [self._sheet_column(k) for k in columns]
+            h = [self.headers[k - self.datacol] for k in cols]
+        if not rowdict:
             h = None
-        for i in range(self.datarow, self.lastrow):
+        for i, cells in self._gen_data(cols, mask=mask):
+            try:
+                yield i, self._parse_row(cells, _make_dict=h)
+            except _EmptyRow:
+                continue
+
+    def _gen_data(self, cols=None, mask=None):
+        """
+        Generates i, cells for the data rows that are in the mask
+        :param cols: [None] columns of the underlying sheet to read; default is all, from datacol
+        :param mask:
+        :return:
+        """
+        if cols is None:
+            rows = self._gen_region(self.datarow, self.lastrow, self.datacol, self._s.ncols)
+        else:
+            rows = self._gen_columns(self.datarow, self.lastrow, cols)
+        for i, cells in enumerate(rows, start=self.datarow):
             in_mask = i - self.datarow
             if mask is not None:
                 if not mask[in_mask]:
                     continue
-            try:
-                yield i, self._read_row(i, _make_dict=h)
-            except _EmptyRow:
-                continue
+            yield i, cells
+
+    def select(self, *columns, mask=None, rowdict=False):
+        """
+        Projection of the data rows onto the given columns, which are resolved once
+        :param columns: names or positions, as find_column
+        :param mask:
+        :param rowdict:
+        :return: generates i, row tuples, as gen_rows
+        """
+        return self.gen_rows(mask=mask, rowdict=rowdict, columns=columns)
 
     def __getitem__(self, item):
         if isinstance(item, int):
@@ -411,16 +670,26 @@ class XlSheet(XlrdSheetLike):
             return int(column)
         except ValueError:
             try:
-                return self.headers.index(column)
-            except ValueError:
-                try:
-                    return next(i for i, k in enumerate(self.headers) if k is not None and k.startswith(column))
-                except StopIteration:
-                    raise KeyError('Column %s not found' % column)
+                return self.header_index.find(column)
+            except KeyError:
+                raise KeyError('Column %s not found' % column)
 
     def _find_column(self, column):
         return self.find_column(column) + self.datacol
 
+    def _sheet_column(self, column):
+        """
+        _find_column, with negative positions counted from ncols and checked against the sheet
+        :param column:
+        :return:
+        """
+        column = self._find_column(column)
+        if column < 0:
+            column += self._s.ncols
+        if not 0 <= column < self._s.ncols:
+            raise IndexError(column)
+        return column
+
     def row(self, row, rowdict=False):
         if rowdict:
             h = self.headers
@@ -432,16 +701,32 @@ class XlSheet(XlrdSheetLike):
         return self.row(row, rowdict=True)
 
     def col(self, column, mask=None):
-        column = self._find_column(column)
+        column = self._sheet_column(column)
+        if getattr(self._s, 'random_access', True):
+            dat = self._s.col(column)[self.datarow:self.lastrow]
+        else:
+            # a streamed column costs a pass either way; this one stops at lastrow
+            dat = [k[0] for k in self._gen_region(self.datarow, self.lastrow, column, column + 1)]
         if mask is None:
-            return self._s.col(column)[self.datarow:self.lastrow]
+            return dat
         else:
-            dat = self._s.col(column)[self.datarow:self.lastrow]
             return [k for i, k in enumerate(dat) if mask[i]]
 
     def cell(self, row, col):
         return self._s.cell(row, col)
 
+    def read_block(self, r0, r1, c0, c1):
+        """
+        As cell(), addressed in the coordinates of the underlying sheet
+        """
+        return read_block(self._s, r0, r1, c0, c1)
+
+    def read_columns(self, r0, r1, c0, c1):
+        """
+        As read_block, by column
+        """
+        return read_columns(self._s, r0, r1, c0, c1)
+
     def col_data(self, column, mask=None):
         return [clean_value(k) for k in self.col(column, mask=mask)]
 
@@ -460,8 +745,214 @@ class XlSheet(XlrdSheetLike):
             except TypeError:
                 return set(zip(*(self.col_data(column, mask=mask) for column in columns)))
 
+    def aggregate(self, by=None, sum=None, count=False, min=None, max=None, mask=None, dataframe=False):
+        """
+        Grouped totals, computed in one pass over the data rows.  Each argument takes a column (name or position,
+        as find_column) or a list of them.
+
+        Groups are keyed on the cleaned values of the 'by' columns (as unique()), in order of first appearance.
+        Sums add up numeric cells only (as total()); min and max consider all cells that hold a value (not empty,
+        blank or error), so a column mixing text and numbers raises TypeError.  With ROW_GAPS, blank rows are skipped,
+        as in gen_rows: rows with no data in any column from datacol on, whichever columns are aggregated.
+
+        :param by: grouping column(s); with none, the whole table is one group
+        :param sum: column(s) to total, reported as 'sum(<header>)'
+        :param count: True to count each group's rows, as 'count'; or column(s) whose non-empty cells to count, as
+         'count(<header>)'
+        :param min: column(s), reported as 'min(<header>)'
+        :param max: column(s), reported as 'max(<header>)'
+        :param mask:
+        :param dataframe: [False] return a pandas DataFrame with a column per key, instead of a list of dicts
+        :return:
+        """
+        count_rows = count is True
+        by, sums, mins, maxs = _as_list(by), _as_list(sum), _as_list(min), _as_list(max)
+        counts = [] if count_rows else _as_list(count)
+
+        # resolve every column once, and read each sheet column only once
+        specs = [[self._sheet_column(k) for k in spec] for spec in (by, counts, sums, mins, maxs)]
+        cols = set(k for spec in specs for k in spec)
+        skip_empty = self._getopt(ROW_GAPS)
+        if skip_empty:
+            # whether a row is blank depends on all of its cells, as in gen_rows: read them all
+            cols.update(range(self.datacol, self._s.ncols))
+        elif not cols:
+            cols.add(self.datacol)  # nothing to read but the rows themselves, to count them
+        cols = sorted(cols)
+        pos = {k: i for i, k in enumerate(cols)}
+        by_ix, count_ix, sum_ix, min_ix, max_ix = [[pos[k] for k in spec] for spec in specs]
+
+        groups = dict()
+        if not by_ix:
+            groups[()] = _Group(len(count_ix), len(sum_ix), len(min_ix), len(max_ix))
+        for i, cells in self._gen_data(cols, mask=mask):
+            if skip_empty and not any(_HAS_DATA[k.ctype] for k in cells):
+                continue
+            key = tuple(clean_value(cells[j]) for j in by_ix)
+            try:
+                g = groups[key]
+            except KeyError:
+                g = groups[key] = _Group(len(count_ix), len(sum_ix), len(min_ix), len(max_ix))
+            g.rows += 1
+            for a, j in enumerate(count_ix):
+                if cells[j].ctype not in (XL_CELL_EMPTY, XL_CELL_BLANK):
+                    g.counts[a] += 1
+            for a, j in enumerate(sum_ix):
+                if cells[j].ctype == XL_CELL_NUMBER:
+                    g.sums[a] += cells[j].value
+            for a, j in enumerate(min_ix):
+                if cells[j].ctype not in (XL_CELL_EMPTY, XL_CELL_BLANK, XL_CELL_ERROR):
+                    v = clean_value(cells[j])
+                    if g.mins[a] is None or v < g.mins[a]:
+                        g.mins[a] = v
+            for a, j in enumerate(max_ix):
+                if cells[j].ctype not in (XL_CELL_EMPTY, XL_CELL_BLANK, XL_CELL_ERROR):
+                    v = clean_value(cells[j])
+                    if g.maxs[a] is None or v > g.maxs[a]:
+                        g.maxs[a] = v
+
+        def _names(op, spec):
+            return ['%s(%s)' % (op, self.headers[k - self.datacol]) for k in spec]
+
+        by_names = [self.headers[k - self.datacol] for k in specs[0]]
+        count_names = ['count'] if count_rows else _names('count', specs[1])
+        sum_names, min_names, max_names = _names('sum', specs[2]), _names('min', specs[3]), _names('max', specs[4])
+        names = by_names + count_names + sum_names + min_names + max_names
+
+        records = []
+        for key, g in groups.items():
+            values = list(key) + ([g.rows] if count_rows else g.counts) + g.sums + g.mins + g.maxs
+            records.append(dict(zip(names, values)))
+        if dataframe:
+            import pandas as pd
+            return pd.DataFrame(records, columns=names)
+        return records
+
+    def _data_columns(self, mask=None):
+        """
+        Read the data region once, with read_columns().  Rows outside the mask are dropped, as are blank rows with
+        ROW_GAPS.
+        :param mask:
+        :return: a list of value lists and a list of ctype bytes, one each per header
+        """
+        r0, r1 = self.datarow, max(self.lastrow, self.datarow)
+        values, ctypes = read_columns(self._s, r0, r1, self.datacol, self.datacol + len(self.headers))
+        return self._select_rows(values, ctypes, 0, r1 - r0, mask)
+
+    def _gen_column_batches(self, batch_rows, mask=None):
+        """
+        _data_columns, batch_rows rows of the data region at a time (fewer, after dropping rows)
+        :param batch_rows:
+        :param mask:
+        :return:
+        """
+        r0, r1 = self.datarow, max(self.lastrow, self.datarow)
+        batches = iter_columns(self._s, r0, r1, self.datacol, self.datacol + len(self.headers), batch_rows)
+        for r, (values, ctypes) in zip(range(r0, r1, batch_rows), batches):
+            yield self._select_rows(values, ctypes, r - r0, min(r + batch_rows, r1) - r, mask)
+
+    def _select_rows(self, values, ctypes, offset, n, mask):
+        """
+        Drop rows outside the mask, and blank rows with ROW_GAPS, from n rows of columns
+        :param values:
+        :param ctypes:
+        :param offset: index of the first row in the mask
+        :param n:
+        :param mask:
+        :return: values, ctypes
+        """
+        keep = None
+        if mask is not None:
+            keep = bytes(1 if mask[i] else 0 for i in range(offset, offset + n))
+        if self._getopt(ROW_GAPS) and ctypes:
+            # a row has data if any of its columns does: OR the columns' 0/1 bytes together, as big integers
+            acc = 0
+            for t in ctypes:
+                acc |= int.from_bytes(t.translate(_HAS_DATA), 'big')
+            has_data = acc.to_bytes(n, 'big')
+            keep = has_data if keep is None else bytes(a & b for a, b in zip(keep, has_data))
+        if keep is not None and keep.count(1) < n:
+            values = [list(compress(v, keep)) for v in values]
+            ctypes = [bytes(compress(t, keep)) for t in ctypes]
+        return values, ctypes
+
     def to_dataframe(self, mask=None, **kwargs):
+        """
+        Each column gets a dtype according to the types of its cells (see typed_columns): int64, float64, bool or
+        datetime64 where they fit, object otherwise.  Empty cells are NaN / NaT in typed columns, None in object ones.
+        :param mask:
+        :param kwargs: passed to the DataFrame constructor
+        :return:
+        """
         import pandas as pd
-        return pd.DataFrame({k: self.col_data(i, mask=mask) for i, k in enumerate(self.headers)}, **kwargs)
+        from .typed_columns import numpy_column
+        headers = self.headers
+        values, ctypes = self._data_columns(mask=mask)
+        data = [numpy_column(v, t) for v, t in zip(values, ctypes)]
+        return pd.DataFrame({k: data[i] for i, k in enumerate(headers)}, **kwargs)
 
+    def _gen_record_batches(self, batch_rows, mask=None, schema=None):
+        """
+        Typed Arrow record batches of the data region.  Unless a schema is given, the first batch fixes it: each
+        column is typed as typed_columns.arrow_column types it, and a column with no values in the first batch is
+        typed as string.  Later batches are cast to the schema.
+        :param batch_rows:
+        :param mask:
+        :param schema: [None] a pyarrow Schema
+        :return: the schema, and a generator of RecordBatches
+        """
+        import pyarrow as pa
+        from .typed_columns import arrow_column
+        names = [str(k) for k in self.headers]
+        batches = self._gen_column_batches(batch_rows, mask=mask)
+        first = None
+        if schema is None:
+            for values, ctypes in batches:
+                first = [arrow_column(v, t) for v, t in zip(values, ctypes)]
+                break
+            if first is None:
+                types = [pa.string()] * len(names)
+            else:
+                types = [pa.string() if pa.types.is_null(k.type) else k.type for k in first]
+            schema = pa.schema([pa.field(k, t) for k, t in zip(names, types)])
+
+        def _gen():
+            if first is not None:
+                arrays = [k.cast(f.type) if k.type != f.type else k for k, f in zip(first, schema)]
+                yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+            for values, ctypes in batches:
+                arrays = [arrow_column(v, t, f.type) for v, t, f in zip(values, ctypes, schema)]
+                yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+        return schema, _gen()
+
+    def to_arrow(self, mask=None, batch_rows=65536, schema=None):
+        """
+        The data region as a pyarrow Table, with a column per header
+        :param mask:
+        :param batch_rows: [65536] rows read and converted at a time; the first batch decides the column types
+        :param schema: [None] a pyarrow Schema to cast to, instead
+        :return:
+        """
+        import pyarrow as pa
+        schema, batches = self._gen_record_batches(batch_rows, mask=mask, schema=schema)
+        return pa.Table.from_batches(list(batches), schema=schema)
 
+    def write_parquet(self, path, mask=None, batch_rows=65536, schema=None, **kwargs):
+        """
+        Stream the data region into a Parquet file, one row group per batch.  Only one batch is held in memory at a
+        time.
+        :param path: file path or writable binary file object
+        :param mask:
+        :param batch_rows: [65536] rows read and written at a time; the first batch decides the column types
+        :param schema: [None] a pyarrow Schema to cast to, instead
+        :param kwargs: passed to pyarrow.parquet.ParquetWriter (e.g. compression)
+        :return: the number of rows written
+        """
+        import pyarrow.parquet as pq
+        schema, batches = self._gen_record_batches(batch_rows, mask=mask, schema=schema)
+        count = 0
+        with pq.ParquetWriter(path, schema, **kwargs) as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+                count += batch.num_rows
+        return count
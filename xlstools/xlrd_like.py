@@ -23,6 +23,7 @@ XlCellLike: cell equivalent
 """
 import abc
 from datetime import datetime
+from itertools import islice
 
 import openpyxl
 from xlrd.biffh import (
@@ -36,35 +37,100 @@ from xlrd.biffh import (
 )
 
 
+_EXACT_CTYPES = {
+    str: XL_CELL_TEXT,
+    int: XL_CELL_NUMBER,
+    float: XL_CELL_NUMBER,
+    bool: XL_CELL_NUMBER,  # bool is an int, and so has always come out as a number below
+    datetime: XL_CELL_DATE,
+    type(None): XL_CELL_EMPTY,
+}
+
+
+def value_ctype(value):
+    """
+    The xlrd ctype of a native value
+    :param value:
+    :return:
+    """
+    try:
+        return _EXACT_CTYPES[type(value)]
+    except KeyError:
+        pass
+    if value is None:
+        return XL_CELL_EMPTY
+    elif isinstance(value, openpyxl.compat.NUMERIC_TYPES):
+        # TODO: figure out how to detect excel-style dates
+        return XL_CELL_NUMBER
+    elif isinstance(value, bool):
+        return XL_CELL_BOOLEAN
+    elif isinstance(value, datetime):
+        return XL_CELL_DATE
+    else:
+        return XL_CELL_TEXT
+
+
 class XlrdCellLike(object):
     """
-    Subclass this to change how cells are interpreted as value + type
+    An immutable (ctype, value) pair, as xlrd's Cell.  The ctype is worked out once, at construction, and text values
+    are stored as str.  All empty cells of a class are the same instance (for this class, EMPTY_CELL).
+
+    Pass ctype explicitly to skip the type test when it is already known (e.g. from a ValueGrid).
+
+    Subclass this to change how cells are interpreted as value + type: since cells are immutable, a subclass converts
+    its argument in __new__ and passes the value (and ctype, if known) on to XlrdCellLike.__new__.  __init__ does
+    nothing.
     """
-    def __init__(self, cell):
-        self._cell = cell
+    __slots__ = ('ctype', 'value')
 
-    @property
-    def value(self):
-        if self.ctype == XL_CELL_TEXT:
-            return str(self._cell)
-        return self._cell
+    def __new__(cls, cell, ctype=None):
+        if cell is None:
+            try:
+                return _EMPTY_CELLS[cls]
+            except KeyError:
+                ctype = XL_CELL_EMPTY
+        elif ctype is None:
+            ctype = value_ctype(cell)
+        if ctype == XL_CELL_TEXT:
+            cell = str(cell)
+        self = object.__new__(cls)
+        _set_ctype(self, ctype)
+        _set_value(self, cell)
+        if cell is None:
+            _EMPTY_CELLS[cls] = self
+        return self
 
-    @property
-    def ctype(self):
-        if self._cell is None:
-            return XL_CELL_EMPTY
-        elif isinstance(self._cell, openpyxl.compat.NUMERIC_TYPES):
-            # TODO: figure out how to detect excel-style dates
-            return XL_CELL_NUMBER
-        elif isinstance(self._cell, bool):
-            return XL_CELL_BOOLEAN
-        elif isinstance(self._cell, datetime):
-            return XL_CELL_DATE
-        else:
-            return XL_CELL_TEXT
+    def __init__(self, cell, ctype=None):
+        pass
+
+    def __setattr__(self, key, value):
+        raise AttributeError('%s is immutable' % self.__class__.__name__)
+
+    def __reduce__(self):
+        return _make_cell, (self.__class__, self.value, self.ctype)
+
+    def __repr__(self):
+        return '%s(%r)' % (self.__class__.__name__, self.value)
+
+
+def _make_cell(cls, value, ctype):
+    """
+    Unpickle a cell of any subclass, from its value and ctype as they were, without converting them again
+    """
+    return XlrdCellLike.__new__(cls, value, ctype)
+
+
+_set_ctype = XlrdCellLike.ctype.__set__
+_set_value = XlrdCellLike.value.__set__
+
+_EMPTY_CELLS = dict()
+EMPTY_CELL = XlrdCellLike(None)
 
 
 class XlrdSheetLike(object):
+    # False for sheets that can only be streamed front to back, where each row() or col() call costs a full pass
+    random_access = True
+
     @property
     def name(self):
         raise NotImplementedError
@@ -89,6 +155,79 @@ class XlrdSheetLike(object):
     def get_rows(self):
         raise NotImplementedError
 
+    def _clamp_block(self, r0, r1, c0, c1):
+        return max(r0, 0), min(r1, self.nrows), max(c0, 0), min(c1, self.ncols)
+
+    def read_block(self, r0, r1, c0, c1):
+        """
+        Read the rectangle of rows r0 <= r < r1 and columns c0 <= c < c1 (0-indexed, end-exclusive, clipped to the
+        sheet).  Rows are always c1 - c0 cells wide, padded with EMPTY_CELL.
+        This generic version reads row by row; subclasses override it with something faster.
+        :param r0:
+        :param r1:
+        :param c0:
+        :param c1:
+        :return: list of lists of cells
+        """
+        r0, r1, c0, c1 = self._clamp_block(r0, r1, c0, c1)
+        width = max(c1 - c0, 0)
+        block = []
+        for r in range(r0, r1):
+            cells = self.row(r)[c0:c1]
+            if len(cells) < width:
+                cells = cells + [EMPTY_CELL] * (width - len(cells))
+            block.append(cells)
+        return block
+
+    def read_columns(self, r0, r1, c0, c1):
+        """
+        The same rectangle as read_block, by column: for each column c0 <= c < c1, a list of values and a bytes
+        object of the matching ctypes.  Backends that hold plain values override this to skip creating cells.
+        This generic version reads blocks of rows (or, for a sheet that can only be streamed, makes one pass).
+        :param r0:
+        :param r1:
+        :param c0:
+        :param c1:
+        :return: list of value lists, list of ctype bytes
+        """
+        r0, r1, c0, c1 = self._clamp_block(r0, r1, c0, c1)
+        width = max(c1 - c0, 0)
+        values = [[] for _ in range(width)]
+        ctypes = [bytearray() for _ in range(width)]
+        for batch_values, batch_ctypes in self.iter_columns(r0, r1, c0, c1, 256):
+            for v, t, bv, bt in zip(values, ctypes, batch_values, batch_ctypes):
+                v.extend(bv)
+                t.extend(bt)
+        return values, [bytes(t) for t in ctypes]
+
+    def iter_columns(self, r0, r1, c0, c1, batch_rows):
+        """
+        read_columns, batch_rows rows at a time: generates (values, ctypes) for rows r0 to r0 + batch_rows, and so on,
+        every batch but the last being full.  This generic version calls read_block() per batch, or, for a sheet that
+        can only be streamed, reads the rows in a single pass.
+        :param r0:
+        :param r1:
+        :param c0:
+        :param c1:
+        :param batch_rows:
+        :return:
+        """
+        r0, r1, c0, c1 = self._clamp_block(r0, r1, c0, c1)
+        width = max(c1 - c0, 0)
+        rows = None if self.random_access else islice(self.get_rows(), r0, r1)
+        for r in range(r0, r1, batch_rows):
+            n = min(r + batch_rows, r1) - r
+            if rows is None:
+                block = self.read_block(r, r + n, c0, c1)
+            else:
+                block = [k[c0:c1] for k in islice(rows, n)]
+                block.extend([EMPTY_CELL] * width for _ in range(len(block), n))
+            if block and width:
+                columns = list(zip(*block))
+            else:
+                columns = [()] * width
+            yield [[k.value for k in col] for col in columns], [bytes(k.ctype for k in col) for col in columns]
+
     def row_dict(self, row):
         """
         Creates a dictionary of the nth row using the 0th row as keynames
@@ -100,13 +239,88 @@ class XlrdSheetLike(object):
         return {headers[i]: k.value for i, k in enumerate(self.row(row)[:len(headers)])}
 
 
+def read_block(sheet, r0, r1, c0, c1):
+    """
+    XlrdSheetLike.read_block() for any sheet, including native xlrd sheets (which are read with row_slice)
+    :param sheet:
+    :param r0:
+    :param r1:
+    :param c0:
+    :param c1:
+    :return: list of lists of cells
+    """
+    if isinstance(sheet, XlrdSheetLike):
+        return sheet.read_block(r0, r1, c0, c1)
+    r0, r1, c0, c1 = max(r0, 0), min(r1, sheet.nrows), max(c0, 0), min(c1, sheet.ncols)
+    if c1 <= c0:
+        return [[] for _ in range(r0, r1)]
+    return [sheet.row_slice(r, c0, c1) for r in range(r0, r1)]
+
+
+def read_columns(sheet, r0, r1, c0, c1):
+    """
+    XlrdSheetLike.read_columns() for any sheet, including native xlrd sheets (which are read with col_values and
+    col_types)
+    :param sheet:
+    :param r0:
+    :param r1:
+    :param c0:
+    :param c1:
+    :return: list of value lists, list of ctype bytes
+    """
+    if isinstance(sheet, XlrdSheetLike):
+        return sheet.read_columns(r0, r1, c0, c1)
+    r0, r1, c0, c1 = max(r0, 0), min(r1, sheet.nrows), max(c0, 0), min(c1, sheet.ncols)
+    r1 = max(r0, r1)
+    values = [sheet.col_values(j, r0, r1) for j in range(c0, c1)]
+    ctypes = [bytes(sheet.col_types(j, r0, r1)) for j in range(c0, c1)]
+    return values, ctypes
+
+
+def iter_columns(sheet, r0, r1, c0, c1, batch_rows):
+    """
+    XlrdSheetLike.iter_columns() for any sheet
+    :param sheet:
+    :param r0:
+    :param r1:
+    :param c0:
+    :param c1:
+    :param batch_rows:
+    :return:
+    """
+    if isinstance(sheet, XlrdSheetLike):
+        yield from sheet.iter_columns(r0, r1, c0, c1, batch_rows)
+        return
+    r0, r1 = max(r0, 0), min(r1, sheet.nrows)
+    for r in range(r0, r1, batch_rows):
+        yield read_columns(sheet, r, min(r + batch_rows, r1), c0, c1)
+
+
+def value_columns(rows, width):
+    """
+    (values, ctypes) by column, as read_columns returns them, from rows of native values, each padded to width
+    :param rows: list of value sequences
+    :param width:
+    :return:
+    """
+    if rows and width:
+        values = [list(k) for k in zip(*rows)]
+    else:
+        values = [[] for _ in range(width)]
+    return values, [bytes(map(value_ctype, k)) for k in values]
+
+
 class XlrdWorkbookLike(abc.ABC):
     """
      .sheet_names() - return list of sheet names
      .sheet_by_name() - return an XlSheetLike given by name
      .sheet_by_index() - return an XlSheetLike given by index
      .sheets() - return a list of XlSheetLikes-- requires initializing every sheet
+     .unload_sheet() - drop a sheet's parsed data, if the backend keeps any; it is read again on next access
+     .names_version - changes whenever the sheet names do, so that callers may keep their own copy
     """
+    _names_version = 0
+
     def sheet_names(self):
         raise NotImplementedError
 
@@ -119,6 +333,34 @@ class XlrdWorkbookLike(abc.ABC):
     def sheets(self):
         raise NotImplementedError
 
+    def unload_sheet(self, sheet_name_or_index):
+        """
+        Per xlrd's Book.unload_sheet.  The default keeps nothing to unload.
+        :param sheet_name_or_index:
+        :return:
+        """
+        pass
+
+    @property
+    def names_version(self):
+        """
+        Writable workbooks bump this in create_sheet (or anything else that adds, removes or renames sheets)
+        :return:
+        """
+        return self._names_version
+
+    def _sheet_index(self, sheet_name_or_index):
+        """
+        An unknown name raises what sheet_by_name raises for it (KeyError, unless the backend has its own error)
+        """
+        if isinstance(sheet_name_or_index, int):
+            return sheet_name_or_index
+        names = list(self.sheet_names())
+        if sheet_name_or_index in names:
+            return names.index(sheet_name_or_index)
+        self.sheet_by_name(sheet_name_or_index)
+        raise KeyError(sheet_name_or_index)
+
     def __getitem__(self, item):
         if isinstance(item, int):
             return self.sheet_by_index(item)
@@ -130,6 +372,18 @@ class XlrdWorkbookLike(abc.ABC):
         raise NotImplementedError
 
 
+def unload_sheet(book, sheet_name_or_index):
+    """
+    XlrdWorkbookLike.unload_sheet() for any workbook, including xlrd Books.  A Book that is not on_demand has already
+    closed its file, so its sheets could not be loaded again: they are kept.
+    :param book:
+    :param sheet_name_or_index:
+    :return:
+    """
+    if isinstance(book, XlrdWorkbookLike) or getattr(book, 'on_demand', False):
+        book.unload_sheet(sheet_name_or_index)
+
+
 class XlrdWriteWorkbook(XlrdWorkbookLike):
     """
      .create_sheet()